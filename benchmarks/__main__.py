@@ -0,0 +1,59 @@
+"""Load benchmarks for the auth and contacts endpoints.
+
+    python -m benchmarks                       # every scenario
+    python -m benchmarks list me --requests 2000 --contacts 10000
+    python -m benchmarks --json results.json
+
+Logins are bcrypt-bound, so they use ``--login-requests`` instead of
+``--requests``.
+"""
+import argparse
+import asyncio
+import json
+
+from benchmarks.harness import BenchmarkApp
+from benchmarks.scenarios import SCENARIOS
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    summaries = []
+    async with BenchmarkApp(users=args.users, contacts=args.contacts) as bench:
+        print(
+            f"seeded {args.users} user(s) x {args.contacts} contacts, "
+            f"concurrency {args.concurrency}"
+        )
+        for name in args.scenarios:
+            requests = args.login_requests if name == "login" else args.requests
+            result = await SCENARIOS[name](bench, requests, args.concurrency)
+            print(result)
+            summaries.append(result.summary())
+    return summaries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "scenarios", nargs="*", metavar="scenario", help=f"any of: {', '.join(SCENARIOS)}"
+    )
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--contacts", type=int, default=1000, help="contacts per user")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--login-requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    summaries = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Micro-benchmark of the auth dependency chain with and without the JWT cache.
+
+Calls ``src.core.depend_service.get_current_user`` directly with a warm
+principal cache and an in-sync revocation filter, so the numbers isolate
+the per-request cost of token verification::
+
+    python -m benchmarks.auth_dependency --iterations 20000
+"""
+import argparse
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+from benchmarks.fake_redis import fake_redis_client
+from src.core.cache import TTLCache
+from src.core.depend_service import get_current_user
+from src.core.principal_cache import principal_cache
+from src.core.token_revocation import token_revocation
+from src.entity.models import User, UserRole
+from src.services import auth
+from src.services.auth import AuthService
+
+
+async def measure(auth_service: AuthService, token: str, iterations: int) -> float:
+    await get_current_user(token, auth_service)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await get_current_user(token, auth_service)
+    return (time.perf_counter() - started) / iterations
+
+
+async def run(args: argparse.Namespace) -> None:
+    user = User(
+        id=1,
+        username="bench",
+        email="bench@example.com",
+        hash_password="",
+        avatar=None,
+        confirmed=True,
+        role=UserRole.USER,
+        token_epoch=0,
+    )
+    redis = fake_redis_client()
+    with patch.object(auth, "redis_client", redis), patch.object(
+        principal_cache, "redis", redis
+    ), patch.object(token_revocation, "synced", True):
+        await principal_cache.set(user)
+        auth_service = AuthService(AsyncMock())
+        token = auth_service.create_access_token(user.username)
+
+        with patch.object(auth, "access_token_cache", TTLCache(0, 0)):
+            uncached = await measure(auth_service, token, args.iterations)
+        cached = await measure(auth_service, token, args.iterations)
+
+    print(f"without token cache: {uncached * 1e6:8.2f} us/call")
+    print(f"with token cache:    {cached * 1e6:8.2f} us/call")
+    print(f"speedup:             {uncached / cached:8.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""In-memory Redis stand-in that plugs in underneath the real redis-py client.
+
+Only the connection is replaced, so client code paths (pipelines,
+response callbacks, round-trip instrumentation) run unchanged. Supports
+the commands the application uses.
+"""
+import fnmatch
+import time
+from collections import deque
+
+from redis.asyncio import ConnectionPool
+from redis.asyncio.connection import Connection
+
+from src.database.redis_client import InstrumentedRedis
+
+
+class FakeServer:
+    def __init__(self):
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.published: list[tuple[bytes, bytes]] = []
+
+    @staticmethod
+    def _b(value) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def _get(self, key: bytes):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, name, *args):
+        handler = getattr(self, f"cmd_{self._b(name).decode().lower()}")
+        return handler(*(self._b(arg) for arg in args))
+
+    def cmd_get(self, key):
+        return self._get(key)
+
+    def cmd_set(self, key, value, *options):
+        options = [option.upper() for option in options]
+        expires_at = None
+        if b"EX" in options:
+            expires_at = time.time() + int(options[options.index(b"EX") + 1])
+        if b"PX" in options:
+            expires_at = time.time() + int(options[options.index(b"PX") + 1]) / 1000
+        exists = self._get(key) is not None
+        if (b"NX" in options and exists) or (b"XX" in options and not exists):
+            return None
+        self.data[key] = (value, expires_at)
+        return b"OK"
+
+    def cmd_setex(self, key, ttl, value):
+        self.data[key] = (value, time.time() + int(ttl))
+        return b"OK"
+
+    def cmd_exists(self, *keys):
+        return sum(self._get(key) is not None for key in keys)
+
+    def cmd_delete(self, *keys):
+        return self.cmd_del(*keys)
+
+    def cmd_del(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def cmd_incr(self, key):
+        return self.cmd_incrby(key, b"1")
+
+    def cmd_incrby(self, key, amount):
+        value = int(self._get(key) or 0) + int(amount)
+        expires_at = self.data.get(key, (None, None))[1]
+        self.data[key] = (self._b(value), expires_at)
+        return value
+
+    def cmd_ttl(self, key):
+        if self._get(key) is None:
+            return -2
+        expires_at = self.data[key][1]
+        return -1 if expires_at is None else int(expires_at - time.time())
+
+    def cmd_publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    def cmd_scan(self, cursor, *args):
+        options = dict(zip(args[::2], args[1::2]))
+        pattern = options.get(b"MATCH", b"*").decode()
+        keys = [
+            key for key in list(self.data)
+            if self._get(key) is not None and fnmatch.fnmatchcase(key.decode(), pattern)
+        ]
+        return [b"0", keys]
+
+
+class FakeConnection(Connection):
+    def __init__(self, *, server: FakeServer, **kwargs):
+        super().__init__(**kwargs)
+        self.server = server
+        self._connected = False
+        self._responses: deque = deque()
+        self._transaction: list | None = None
+
+    @property
+    def is_connected(self):
+        return self._connected
+
+    async def connect(self):
+        self._connected = True
+
+    async def disconnect(self, nowait: bool = False) -> None:
+        self._connected = False
+        self._responses.clear()
+
+    async def can_read_destructive(self):
+        return bool(self._responses)
+
+    def pack_command(self, *args):
+        return [args]
+
+    def pack_commands(self, commands):
+        return [tuple(args) for args in commands]
+
+    def _execute(self, name, *args):
+        name = FakeServer._b(name).upper()
+        if name == b"MULTI":
+            self._transaction = []
+            return b"OK"
+        if name == b"EXEC":
+            queued, self._transaction = self._transaction, None
+            return [self.server.execute(*command) for command in queued]
+        if self._transaction is not None:
+            self._transaction.append((name, *args))
+            return b"QUEUED"
+        return self.server.execute(name, *args)
+
+    async def send_packed_command(self, command, check_health=True):
+        for args in command:
+            self._responses.append(self._execute(*args))
+
+    async def send_command(self, *args, **kwargs):
+        await self.send_packed_command(self.pack_command(*args))
+
+    async def read_response(self, *args, **kwargs):
+        return self._responses.popleft()
+
+
+def fake_redis_client(server: FakeServer | None = None) -> InstrumentedRedis:
+    pool = ConnectionPool(connection_class=FakeConnection, server=server or FakeServer())
+    return InstrumentedRedis(connection_pool=pool)
@@ -0,0 +1,205 @@
+"""Shared setup for the in-process benchmarks.
+
+``BenchmarkApp`` runs ``main.app`` over an ``httpx.ASGITransport``. It uses
+a throwaway SQLite database and the in-memory Redis stand-in from
+``benchmarks.fake_redis`` (which the test suite shares), so no network
+service is needed and runs are reproducible.
+"""
+import asyncio
+import statistics
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable
+from unittest.mock import patch
+
+import httpx
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks.fake_redis import fake_redis_client
+from main import app
+from src.core.contacts_cache import contacts_cache
+from src.core.contacts_version import contacts_version
+from src.core.depend_service import get_read_db
+from src.core.hashing import bcrypt_hash, password_hasher
+from src.core.principal_cache import principal_cache
+from src.core.token_revocation import token_revocation
+from src.core.write_fence import write_fence
+from src.database.db import get_db
+from src.entity.models import Base, Contact_Book, User, UserRole
+from src.routes import users
+from src.services import auth
+from src.services.auth import AuthService
+
+PASSWORD = "bench123"
+SEED_CHUNK = 5000
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class Result:
+    name: str
+    latencies: list[float]
+    elapsed: float
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict:
+        ms = [value * 1000 for value in self.latencies]
+        return {
+            "name": self.name,
+            "requests": len(ms),
+            "rps": round(self.throughput, 1),
+            "p50_ms": round(percentile(ms, 50), 2),
+            "p95_ms": round(percentile(ms, 95), 2),
+            "p99_ms": round(percentile(ms, 99), 2),
+            "mean_ms": round(statistics.fmean(ms), 2),
+            "statuses": self.statuses,
+        }
+
+    def __str__(self) -> str:
+        s = self.summary()
+        return (
+            f"{s['name']:<28} n={s['requests']:<6} {s['rps']:>8.1f} req/s "
+            f"p50={s['p50_ms']:8.2f}ms p95={s['p95_ms']:8.2f}ms "
+            f"p99={s['p99_ms']:8.2f}ms  {s['statuses']}"
+        )
+
+
+async def run_load(
+    name: str,
+    request: Callable[[int], Awaitable[httpx.Response]],
+    requests: int,
+    concurrency: int,
+) -> Result:
+    """Issue ``request(i)`` for i in ``range(requests)``, at most ``concurrency`` at once."""
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await request(i)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return Result(name, latencies, time.perf_counter() - started, statuses)
+
+
+class BenchmarkApp:
+    """Seeded application plus an HTTP client bound to it.
+
+    Seeds ``users`` confirmed users (``bench0``, ``bench1``, ...), each
+    owning ``contacts`` contacts.
+    """
+
+    def __init__(self, users: int = 1, contacts: int = 100):
+        self.users = users
+        self.contacts = contacts
+        self.usernames = [f"bench{i}" for i in range(users)]
+        self.tokens: dict[str, str] = {}
+        self.contact_ids: dict[str, list[int]] = {}
+        self.redis = fake_redis_client()
+        self._stack = AsyncExitStack()
+
+    async def __aenter__(self) -> "BenchmarkApp":
+        tmp = self._stack.enter_context(tempfile.TemporaryDirectory())
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        self._stack.push_async_callback(self.engine.dispose)
+        self.session_maker = async_sessionmaker(self.engine, expire_on_commit=False)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await self.seed()
+
+        async def override_get_db():
+            async with self.session_maker() as session:
+                yield session
+
+        for target in (
+            patch.dict(
+                app.dependency_overrides,
+                {get_db: override_get_db, get_read_db: override_get_db},
+            ),
+            patch.object(auth, "redis_client", self.redis),
+            patch.object(principal_cache, "redis", self.redis),
+            patch.object(token_revocation, "redis", self.redis),
+            patch.object(contacts_version, "redis", self.redis),
+            patch.object(contacts_cache, "redis", self.redis),
+            patch.object(write_fence, "redis", self.redis),
+            patch.object(users.limiter, "enabled", False),
+        ):
+            self._stack.enter_context(target)
+        principal_cache.local.clear()
+        auth.access_token_cache.clear()
+
+        self.client = await self._stack.enter_async_context(
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._stack.aclose()
+
+    async def seed(self) -> None:
+        hash_password = bcrypt_hash(PASSWORD, password_hasher.rounds)
+        async with self.session_maker() as session:
+            for username in self.usernames:
+                user = User(
+                    username=username,
+                    email=f"{username}@example.com",
+                    hash_password=hash_password,
+                    confirmed=True,
+                    role=UserRole.USER,
+                )
+                session.add(user)
+                await session.flush()
+                rows = [
+                    {
+                        "name": f"Name{i:07}",
+                        "surname": f"Surname{i:07}",
+                        "email": f"{username}.contact{i}@example.com",
+                        "phone": f"050{i:07}",
+                        "date_of_birth": datetime(1970 + i % 40, 1 + i % 12, 1 + i % 28),
+                        "user_id": user.id,
+                    }
+                    for i in range(self.contacts)
+                ]
+                for start in range(0, len(rows), SEED_CHUNK):
+                    await session.execute(insert(Contact_Book), rows[start : start + SEED_CHUNK])
+                self.tokens[username] = AuthService(session).create_access_token(username)
+                result = await session.execute(
+                    select(Contact_Book.id).where(Contact_Book.user_id == user.id)
+                )
+                self.contact_ids[username] = list(result.scalars())
+            await session.commit()
+
+    def username(self, i: int) -> str:
+        return self.usernames[i % self.users]
+
+    def headers(self, i: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[self.username(i)]}"}
+
+    async def refresh_tokens(self, count: int) -> list[str]:
+        """Issue ``count`` refresh tokens, spread over the seeded users."""
+        tokens = []
+        async with self.session_maker() as session:
+            auth_service = AuthService(session)
+            for i in range(count):
+                user = await auth_service.user_repository.get_by_username(self.username(i))
+                tokens.append(await auth_service.create_refresh_token(user.id, None, None))
+        return tokens
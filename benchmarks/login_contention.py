@@ -0,0 +1,46 @@
+"""p99 latency of ``GET /api/contacts`` while logins hash passwords.
+
+Runs contacts traffic alone, then again alongside a concurrent login
+burst, and prints latency percentiles for both runs::
+
+    python -m benchmarks.login_contention --executor thread
+    python -m benchmarks.login_contention --executor inline   # old behaviour
+"""
+import argparse
+import asyncio
+
+from benchmarks import scenarios
+from benchmarks.harness import BenchmarkApp
+from src.core.hashing import hashing_executor
+
+
+async def run(args: argparse.Namespace) -> None:
+    hashing_executor.kind = args.executor
+    async with BenchmarkApp(users=1, contacts=args.contacts) as bench:
+        await scenarios.contacts_list(bench, args.concurrency, args.concurrency)
+        alone = await scenarios.contacts_list(bench, args.requests, args.concurrency)
+        contended, logins = await asyncio.gather(
+            scenarios.contacts_list(bench, args.requests, args.concurrency),
+            scenarios.login(bench, args.logins, args.logins),
+        )
+    hashing_executor.shutdown()
+
+    print(f"contacts only      {alone}")
+    print(f"contacts + logins  {contended}")
+    print(f"logins             {logins}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--executor", choices=hashing_executor.KINDS, default=hashing_executor.kind
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--contacts", type=int, default=100)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Micro-benchmark of the hot repository lookups with prebuilt statements.
+
+Runs ``UserRepository.get_by_username``, ``RefreshTokenRepository.get_active_token``
+and ``ContactBookRepository.get_contact_by_id`` against an in-memory SQLite
+database, next to the same queries built with a fresh ``select()`` per call
+as they were before. ``build`` is the statement construction and cache-key
+cost alone, ``call`` the whole repository method::
+
+    python -m benchmarks.repository_statements --iterations 5000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.entity.models import Base, Contact_Book, RefreshToken, User, UserRole
+from src.repository import contacts_book, refresh_token_repository, user_repository
+from src.repository.contacts_book import ContactBookRepository
+from src.repository.refresh_token_repository import RefreshTokenRepository
+from src.repository.user_repository import UserRepository
+
+
+def per_call_select(name: str, now: datetime):
+    """The statement each lookup used to build on every call."""
+    return {
+        "get_by_username": lambda: select(User).where(User.username == "bench"),
+        "get_active_token": lambda: select(RefreshToken).where(
+            RefreshToken.token_hash == "hash",
+            RefreshToken.expired_at > now,
+            RefreshToken.revoked_at.is_(None),
+        ),
+        "get_contact_by_id": lambda: select(Contact_Book).filter_by(id=1, user_id=1),
+    }[name]
+
+
+PREBUILT = {
+    "get_by_username": user_repository._user_by_username,
+    "get_active_token": refresh_token_repository._active_token,
+    "get_contact_by_id": contacts_book._contact_by_id,
+}
+
+
+def measure_build(build, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build()._generate_cache_key()
+    return (time.perf_counter() - started) / iterations
+
+
+async def measure_call(call, iterations: int) -> float:
+    for _ in range(100):
+        await call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    return (time.perf_counter() - started) / iterations
+
+
+async def seed(session_maker, now: datetime) -> User:
+    async with session_maker() as session:
+        user = User(
+            username="bench",
+            email="bench@example.com",
+            hash_password="",
+            confirmed=True,
+            role=UserRole.USER,
+        )
+        session.add(user)
+        await session.flush()
+        session.add(
+            Contact_Book(
+                id=1,
+                name="Bench",
+                surname="Mark",
+                email="bench@example.com",
+                phone="0",
+                date_of_birth=datetime(1990, 1, 1),
+                user_id=user.id,
+            )
+        )
+        session.add(
+            RefreshToken(user_id=user.id, token_hash="hash", expired_at=now + timedelta(days=1))
+        )
+        await session.commit()
+        return user
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    now = datetime.now(timezone.utc)
+    user = await seed(session_maker, now)
+
+    async with session_maker() as session:
+        calls = {
+            "get_by_username": lambda: UserRepository(session).get_by_username("bench"),
+            "get_active_token": lambda: RefreshTokenRepository(session).get_active_token("hash", now),
+            "get_contact_by_id": lambda: ContactBookRepository(session).get_contact_by_id(1, user),
+        }
+        for name, call in calls.items():
+            build = per_call_select(name, now)
+
+            async def before():
+                return (await session.execute(build())).scalars().first()
+
+            build_before = measure_build(build, args.iterations)
+            build_after = measure_build(lambda: PREBUILT[name], args.iterations)
+            call_before = await measure_call(before, args.iterations)
+            call_after = await measure_call(call, args.iterations)
+            print(
+                f"{name:18} build {build_before * 1e6:7.2f} -> {build_after * 1e6:5.2f} us"
+                f"   call {call_before * 1e6:7.2f} -> {call_after * 1e6:7.2f} us"
+            )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Endpoint scenarios. Each takes a ``BenchmarkApp`` and returns a ``Result``."""
+from benchmarks.harness import PASSWORD, BenchmarkApp, Result, run_load
+from src.core.pagination import encode_cursor
+
+CONTACT = {
+    "name": "Bench",
+    "surname": "Marker",
+    "email": "bench.marker@example.com",
+    "phone": "0501234567",
+    "date_of_birth": "1990-01-01T00:00:00",
+}
+
+
+async def login(bench: BenchmarkApp, requests: int, concurrency: int) -> Result:
+    return await run_load(
+        "POST /api/auth/login",
+        lambda i: bench.client.post(
+            "/api/auth/login", data={"username": bench.username(i), "password": PASSWORD}
+        ),
+        requests,
+        concurrency,
+    )
+
+
+async def refresh(bench: BenchmarkApp, requests: int, concurrency: int) -> Result:
+    tokens = await bench.refresh_tokens(requests)
+    return await run_load(
+        "POST /api/auth/refresh",
+        lambda i: bench.client.post("/api/auth/refresh", json={"refresh_token": tokens[i]}),
+        requests,
+        concurrency,
+    )
+
+
+async def users_me(bench: BenchmarkApp, requests: int, concurrency: int) -> Result:
+    return await run_load(
+        "GET /api/users/me",
+        lambda i: bench.client.get("/api/users/me", headers=bench.headers(i)),
+        requests,
+        concurrency,
+    )
+
+
+async def contacts_list(bench: BenchmarkApp, requests: int, concurrency: int) -> Result:
+    return await run_load(
+        "GET /api/contacts",
+        lambda i: bench.client.get(
+            "/api/contacts/", params={"limit": 50}, headers=bench.headers(i)
+        ),
+        requests,
+        concurrency,
+    )
+
+
+async def contacts_list_deep_offset(
+    bench: BenchmarkApp, requests: int, concurrency: int
+) -> Result:
+    offset = max(bench.contacts - 50, 0)
+    return await run_load(
+        f"GET /api/contacts offset={offset}",
+        lambda i: bench.client.get(
+            "/api/contacts/", params={"limit": 50, "offset": offset}, headers=bench.headers(i)
+        ),
+        requests,
+        concurrency,
+    )
+
+
+async def contacts_list_deep_cursor(
+    bench: BenchmarkApp, requests: int, concurrency: int
+) -> Result:
+    # the same last page as the offset scenario, reached through a cursor
+    depth = max(bench.contacts - 50, 0)
+    cursors = {
+        username: encode_cursor(sorted(ids)[depth - 1])
+        for username, ids in bench.contact_ids.items()
+        if depth
+    }
+
+    def page(i: int):
+        params = {"limit": 50}
+        if depth:
+            params["after"] = cursors[bench.username(i)]
+        return bench.client.get("/api/contacts/", params=params, headers=bench.headers(i))
+
+    return await run_load(f"GET /api/contacts after=#{depth}", page, requests, concurrency)
+
+
+async def contacts_search(bench: BenchmarkApp, requests: int, concurrency: int) -> Result:
+    def search(i: int):
+        # a different seeded surname each time, so results are not cached anywhere
+        term = f"Surname{(i * 7919) % bench.contacts:07}"
+        return bench.client.get(
+            "/api/contacts/search", params={"q": term}, headers=bench.headers(i)
+        )
+
+    return await run_load("GET /api/contacts/search", search, requests, concurrency)
+
+
+async def contacts_create(bench: BenchmarkApp, requests: int, concurrency: int) -> Result:
+    return await run_load(
+        "POST /api/contacts",
+        lambda i: bench.client.post("/api/contacts/", json=CONTACT, headers=bench.headers(i)),
+        requests,
+        concurrency,
+    )
+
+
+async def contacts_update(bench: BenchmarkApp, requests: int, concurrency: int) -> Result:
+    def update(i: int):
+        ids = bench.contact_ids[bench.username(i)]
+        return bench.client.put(
+            f"/api/contacts/{ids[i % len(ids)]}",
+            json={**CONTACT, "name": f"Upd{i:05}"},
+            headers=bench.headers(i),
+        )
+
+    return await run_load("PUT /api/contacts/{id}", update, requests, concurrency)
+
+
+async def contacts_delete(bench: BenchmarkApp, requests: int, concurrency: int) -> Result:
+    def remove(i: int):
+        ids = bench.contact_ids[bench.username(i)]
+        # each request deletes a different seeded contact while they last
+        return bench.client.delete(
+            f"/api/contacts/{ids.pop()}" if ids else "/api/contacts/0",
+            headers=bench.headers(i),
+        )
+
+    return await run_load("DELETE /api/contacts/{id}", remove, requests, concurrency)
+
+
+SCENARIOS = {
+    "login": login,
+    "refresh": refresh,
+    "me": users_me,
+    "list": contacts_list,
+    "list-deep-offset": contacts_list_deep_offset,
+    "list-deep-cursor": contacts_list_deep_cursor,
+    "search": contacts_search,
+    "create": contacts_create,
+    "update": contacts_update,
+    "delete": contacts_delete,
+}
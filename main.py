@@ -1,38 +1,42 @@
-from datetime import datetime, timezone, timedelta
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status, Request, File, UploadFile
 from slowapi.errors import RateLimitExceeded
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi.middleware.cors import CORSMiddleware
 
 
 
+from src.conf.config import settings
+from src.core.hashing import hashing_executor
+from src.core.metrics import metrics
+from src.core.principal_cache import principal_cache
+from src.core.token_revocation import token_revocation
 from src.database.db import get_db, sessionmanager
 from src.routes import contacts_book, auth, users
+from src.services.token_purge import purge_expired_tokens
 
 scheduler = AsyncIOScheduler()
 
-async def cleanup_expired_tokens():
-    async with sessionmanager.session() as db:
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(days=7)
-        stmt = text(
-            "DELETE FROM refresh_tokens WHERE expired_at < :now OR revoked_at IS NOT NULL AND revoked_at < :cutoff"
-        )
-        await db.execute(stmt, {"now": now, "cutoff": cutoff})
-        await db.commit()
-        print(f"Expired tokens cleaned up [{now.strftime('%Y-%m-%d %H:%M:%S')}]")
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    scheduler.add_job(cleanup_expired_tokens, "interval", hours=1)
+    await sessionmanager.warmup(settings.DB_POOL_WARMUP)
+    scheduler.add_job(purge_expired_tokens, "interval", hours=1)
     scheduler.start()
+    listeners = [
+        asyncio.create_task(principal_cache.listen()),
+        asyncio.create_task(token_revocation.listen()),
+    ]
     yield
+    for listener in listeners:
+        listener.cancel()
     scheduler.shutdown()
+    hashing_executor.shutdown()
+    await sessionmanager.close()
 
 app = FastAPI(
     lifespan=lifespan,
@@ -54,6 +58,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # pagination and caching metadata travel in response headers
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
 )
 # app = FastAPI()
 
@@ -66,6 +72,11 @@ def read_root(request: Request):
     return {"message": "Contact Book Application v1.0"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api/healthchecker")
 async def healthchecker(db: AsyncSession = Depends(get_db)):
     try:
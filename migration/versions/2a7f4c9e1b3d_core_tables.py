@@ -0,0 +1,79 @@
+"""Users, contacts and refresh tokens
+
+Revision ID: 2a7f4c9e1b3d
+Revises: f4100c881680
+Create Date: 2026-10-18 17:05:41.208316
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a7f4c9e1b3d'
+down_revision: Union[str, None] = 'f4100c881680'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # databases set up by hand before this revision already have some of
+    # these tables; only the missing ones are created. An offline --sql run
+    # cannot look, so it creates every table with IF NOT EXISTS instead.
+    offline = context.is_offline_mode()
+    existing = set() if offline else set(sa.inspect(op.get_bind()).get_table_names())
+    if 'users' not in existing:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hash_password', sa.String(), nullable=False),
+        sa.Column('avatar', sa.String(length=255), nullable=True),
+        sa.Column('confirmed', sa.Boolean(), nullable=True),
+        sa.Column('role', sa.Enum('USER', 'ADMIN', name='userrole'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username'),
+        if_not_exists=offline
+        )
+    if 'Contact_Book' not in existing:
+        op.create_table('Contact_Book',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('surname', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=200), nullable=False),
+        sa.Column('phone', sa.String(length=15), nullable=False),
+        sa.Column('date_of_birth', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=offline
+        )
+    if 'refresh_tokens' not in existing:
+        op.create_table('refresh_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('token_hash', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expired_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('ip_address', sa.String(length=50), nullable=True),
+        sa.Column('user_agent', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token_hash'),
+        if_not_exists=offline
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('refresh_tokens')
+    op.drop_table('Contact_Book')
+    op.drop_table('users')
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
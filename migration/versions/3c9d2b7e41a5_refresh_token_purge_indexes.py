@@ -0,0 +1,33 @@
+"""Refresh token purge indexes
+
+Revision ID: 3c9d2b7e41a5
+Revises: 6d3b8a1f0e47
+Create Date: 2026-10-18 10:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2b7e41a5'
+down_revision: Union[str, None] = '6d3b8a1f0e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # built without blocking writes; CONCURRENTLY cannot run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_refresh_tokens_expired_at'), 'refresh_tokens', ['expired_at'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_refresh_tokens_revoked_at'), 'refresh_tokens', ['revoked_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_refresh_tokens_revoked_at'), table_name='refresh_tokens', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_refresh_tokens_expired_at'), table_name='refresh_tokens', postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""Contact birth month-day column
+
+Revision ID: 5b2e8c71d4f3
+Revises: c47a9d3e8b12
+Create Date: 2026-10-18 15:02:48.190342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8c71d4f3'
+down_revision: Union[str, None] = 'c47a9d3e8b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('Contact_Book', sa.Column('birth_month_day', sa.Integer(), nullable=True))
+    op.execute(
+        'UPDATE "Contact_Book" SET birth_month_day = '
+        'EXTRACT(MONTH FROM date_of_birth) * 100 + EXTRACT(DAY FROM date_of_birth)'
+    )
+    op.alter_column('Contact_Book', 'birth_month_day', nullable=False)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contact_book_user_id_birth_month_day', 'Contact_Book', ['user_id', 'birth_month_day'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contact_book_user_id_birth_month_day', table_name='Contact_Book', postgresql_concurrently=True)
+    op.drop_column('Contact_Book', 'birth_month_day')
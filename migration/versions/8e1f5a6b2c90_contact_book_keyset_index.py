@@ -0,0 +1,30 @@
+"""Contact book keyset pagination index
+
+Revision ID: 8e1f5a6b2c90
+Revises: 3c9d2b7e41a5
+Create Date: 2026-10-18 12:40:05.301877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e1f5a6b2c90'
+down_revision: Union[str, None] = '3c9d2b7e41a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contact_book_user_id_id', 'Contact_Book', ['user_id', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contact_book_user_id_id', table_name='Contact_Book', postgresql_concurrently=True)
@@ -0,0 +1,30 @@
+"""Refresh token owner index
+
+Revision ID: 9f2c6e4a8d15
+Revises: e93c0f5a7d21
+Create Date: 2026-10-18 17:20:37.846129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f2c6e4a8d15'
+down_revision: Union[str, None] = 'e93c0f5a7d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_refresh_tokens_user_id'), 'refresh_tokens', ['user_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_refresh_tokens_user_id'), table_name='refresh_tokens', postgresql_concurrently=True)
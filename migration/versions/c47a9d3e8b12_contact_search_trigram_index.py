@@ -0,0 +1,36 @@
+"""Contact search trigram index
+
+Revision ID: c47a9d3e8b12
+Revises: 8e1f5a6b2c90
+Create Date: 2026-10-18 13:55:27.614093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.entity.models import CONTACT_SEARCH_DOCUMENT
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47a9d3e8b12'
+down_revision: Union[str, None] = '8e1f5a6b2c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_contact_book_search_trgm ON "Contact_Book" '
+            f"USING gin ({CONTACT_SEARCH_DOCUMENT} gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contact_book_search_trgm', table_name='Contact_Book', postgresql_concurrently=True)
@@ -0,0 +1,43 @@
+"""User contacts count maintained by triggers
+
+Revision ID: e93c0f5a7d21
+Revises: 5b2e8c71d4f3
+Create Date: 2026-10-18 16:21:09.734518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.entity.models import CONTACT_COUNT_PG_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93c0f5a7d21'
+down_revision: Union[str, None] = '5b2e8c71d4f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('contacts_count', sa.Integer(), server_default='0', nullable=False))
+    # lock out contact writes between the backfill and the triggers taking over
+    op.execute('LOCK TABLE "Contact_Book" IN SHARE MODE')
+    op.execute(
+        'UPDATE users SET contacts_count = c.n FROM '
+        '(SELECT user_id, count(*) AS n FROM "Contact_Book" GROUP BY user_id) c '
+        'WHERE users.id = c.user_id'
+    )
+    for ddl in CONTACT_COUNT_PG_DDL:
+        op.execute(ddl)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS contact_book_count_del ON "Contact_Book"')
+    op.execute('DROP TRIGGER IF EXISTS contact_book_count_ins ON "Contact_Book"')
+    op.execute('DROP FUNCTION IF EXISTS contact_book_count_del()')
+    op.execute('DROP FUNCTION IF EXISTS contact_book_count_ins()')
+    op.drop_column('users', 'contacts_count')
@@ -0,0 +1,68 @@
+import json
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.conf.config import settings
+from src.core.metrics import metrics
+from src.database.redis_client import redis_client
+
+logger = logging.getLogger("uvicorn.error")
+
+cache_hits = metrics.counter("contacts_cache_hits_total", "Contact reads served from Redis.")
+cache_misses = metrics.counter(
+    "contacts_cache_misses_total", "Contact reads that went to the database."
+)
+cache_errors = metrics.counter(
+    "contacts_cache_errors_total", "Contact cache operations that failed on Redis."
+)
+
+
+class ContactsCache:
+    """Read-through cache of serialized contact pages and single contacts.
+
+    Keys embed the user's collection version (see ``ContactsVersion``), so
+    a write makes every cached entry of that user unreachable at once and
+    the stale ones simply expire. A TTL of 0 disables that kind of entry.
+    Redis errors count as misses.
+    """
+
+    def __init__(self, redis: Redis, page_ttl: int, item_ttl: int):
+        self.redis = redis
+        self.ttls = {"page": page_ttl, "item": item_ttl}
+
+    @staticmethod
+    def key(user_id: int, version: str, kind: str, *params) -> str:
+        return ":".join(["contacts", str(user_id), version, kind, *map(str, params)])
+
+    async def get(self, kind: str, user_id: int, version: str, *params):
+        if self.ttls[kind] <= 0:
+            return None
+        try:
+            cached = await self.redis.get(self.key(user_id, version, kind, *params))
+        except RedisError as e:
+            cache_errors.inc()
+            logger.warning(f"Contacts cache unavailable: {e}")
+            cached = None
+        if cached is None:
+            cache_misses.inc()
+            return None
+        cache_hits.inc()
+        return json.loads(cached)
+
+    async def set(self, kind: str, user_id: int, version: str, *params, value) -> None:
+        if self.ttls[kind] <= 0:
+            return
+        try:
+            await self.redis.setex(
+                self.key(user_id, version, kind, *params), self.ttls[kind], json.dumps(value)
+            )
+        except RedisError as e:
+            cache_errors.inc()
+            logger.warning(f"Contacts cache not written: {e}")
+
+
+contacts_cache = ContactsCache(
+    redis_client, settings.CONTACTS_CACHE_PAGE_TTL, settings.CONTACTS_CACHE_ITEM_TTL
+)
@@ -0,0 +1,57 @@
+import logging
+import uuid
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.conf.config import settings
+from src.database.redis_client import redis_client
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class ContactsVersion:
+    """Per-user version token of the contact collection, kept in Redis.
+
+    Every contact write replaces the token with a fresh random one, so a
+    token never repeats even if the key is evicted or expires. Readers use
+    it to validate list ETags without touching the database. Redis failures
+    are logged; :meth:`get` then returns ``None`` and callers skip
+    conditional handling, and a failed :meth:`bump` tries to delete the
+    token instead.
+    """
+
+    def __init__(self, redis: Redis, ttl: int):
+        self.redis = redis
+        self.ttl = ttl
+
+    @staticmethod
+    def key(user_id: int) -> str:
+        return f"contacts:version:{user_id}"
+
+    async def get(self, user_id: int) -> str | None:
+        try:
+            version = await self.redis.get(self.key(user_id))
+            if version is None:
+                version = uuid.uuid4().hex
+                if not await self.redis.set(self.key(user_id), version, nx=True, ex=self.ttl):
+                    version = await self.redis.get(self.key(user_id))
+        except RedisError as e:
+            logger.warning(f"Contacts version unavailable: {e}")
+            return None
+        return version.decode() if isinstance(version, bytes) else version
+
+    async def bump(self, user_id: int) -> None:
+        try:
+            await self.redis.set(self.key(user_id), uuid.uuid4().hex, ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Contacts version not bumped for user {user_id}: {e}")
+            # the old token would keep validating ETags until it expires;
+            # dropping it makes the next read start a fresh one
+            try:
+                await self.redis.delete(self.key(user_id))
+            except RedisError as e:
+                logger.warning(f"Contacts version not cleared for user {user_id}: {e}")
+
+
+contacts_version = ContactsVersion(redis_client, settings.CONTACTS_VERSION_TTL)
@@ -1,17 +1,42 @@
+import jwt
 from fastapi import Depends, HTTPException
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db import get_db
+from src.core.write_fence import write_fence
+from src.database.db import get_db, sessionmanager
 from src.services.auth import AuthService, oauth2_scheme
 from src.services.user import UserService
 from src.entity.models import User, UserRole
 
 
+async def get_read_db(token: str = Depends(oauth2_scheme)):
+    """Read-only session: on a replica, or on the primary for a user who
+    wrote in the last ``DB_REPLICA_STICKY_SECONDS``.
+
+    The token subject is read unverified here only to pick a database;
+    authentication still verifies the token.
+    """
+
+    async def sticky() -> bool:
+        try:
+            username = jwt.decode(token, options={"verify_signature": False}).get("sub")
+        except jwt.PyJWTError:
+            return True
+        return username is None or await write_fence.recent(username)
+
+    async with sessionmanager.read_session(sticky=sticky) as session:
+        yield session
+
+
 def get_auth_service(db: AsyncSession = Depends(get_db)):
     return AuthService(db)
 
 
+def get_read_auth_service(db: AsyncSession = Depends(get_read_db)):
+    return AuthService(db)
+
+
 def get_user_service(db: AsyncSession = Depends(get_db)):
     return UserService(db)
 
@@ -23,14 +48,31 @@ async def get_current_user(
     return await auth_service.get_current_user(token)
 
 
-async def get_admin_user(user: User = Depends(get_current_user)) -> User:
-    """
-    Dependency to check if the current user is an admin.
-    Raises HTTPException if the user is not an admin.
-    """
+async def get_current_reader(
+    token: str = Depends(oauth2_scheme),
+    auth_service: AuthService = Depends(get_read_auth_service),
+):
+    """``get_current_user`` for read-only routes, sharing their read session."""
+    return await auth_service.get_current_user(token)
+
+
+def _require_admin(user: User) -> User:
     if user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only administrators can perform this action"
         )
     return user
+
+
+async def get_admin_user(user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency to check if the current user is an admin.
+    Raises HTTPException if the user is not an admin.
+    """
+    return _require_admin(user)
+
+
+async def get_admin_reader(user: User = Depends(get_current_reader)) -> User:
+    """``get_admin_user`` for read-only routes, sharing their read session."""
+    return _require_admin(user)
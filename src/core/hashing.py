@@ -0,0 +1,170 @@
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from src.conf.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def bcrypt_hash(password: str, rounds: int = 12) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+def bcrypt_verify(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+
+
+class PasswordHashingExecutor:
+    """Runs CPU-bound password hashing away from the event loop.
+
+    Work is handed to a bounded thread or process pool. At most
+    ``max_workers + queue_limit`` jobs may be in flight; anything beyond
+    that is rejected with ``503 Service Unavailable`` so a login burst
+    sheds load instead of queueing without limit.
+
+    Functions submitted to a ``"process"`` pool must be picklable, i.e.
+    defined at module level.
+    """
+
+    KINDS = ("thread", "process", "inline")
+
+    def __init__(self, kind: str, max_workers: int, queue_limit: int):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown password hash executor: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor: Executor | None = None
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.queue_limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="pwd-hash"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.kind == "inline":
+            return func(*args)
+        if self._in_flight >= self.capacity:
+            logger.warning("Password hashing queue is full (%s jobs)", self._in_flight)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+class PasswordHasher:
+    """The single place passwords are hashed and verified.
+
+    Hashes are bcrypt with a configurable work factor (``rounds``). Hashes
+    stored with a different cost still verify; :meth:`needs_rehash` tells
+    the caller to re-hash them with the current cost once the plain
+    password is at hand, so a cost change rolls out on login without a
+    migration.
+    """
+
+    MIN_ROUNDS = 4
+    MAX_ROUNDS = 31
+
+    def __init__(self, executor: PasswordHashingExecutor, rounds: int):
+        if not self.MIN_ROUNDS <= rounds <= self.MAX_ROUNDS:
+            raise ValueError(f"bcrypt rounds must be between 4 and 31, got {rounds}")
+        self.executor = executor
+        self.rounds = rounds
+
+    @staticmethod
+    def cost_of(hashed_password: str) -> int | None:
+        parts = hashed_password.split("$")
+        if len(parts) < 4 or not parts[1].startswith("2") or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return self.cost_of(hashed_password) != self.rounds
+
+    async def hash(self, password: str) -> str:
+        return await self.executor.run(bcrypt_hash, password, self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.executor.run(bcrypt_verify, plain_password, hashed_password)
+
+
+def calibrate(
+    target_ms: float, samples: int = 5, min_rounds: int = 8, max_rounds: int = 16
+) -> list[tuple[int, float]]:
+    """Time bcrypt on this host for each cost in ``min_rounds..max_rounds``.
+
+    Stops after the first cost whose median exceeds ``target_ms``. Returns
+    ``(rounds, median_ms)`` pairs.
+    """
+    timings = []
+    for rounds in range(min_rounds, max_rounds + 1):
+        durations = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            bcrypt_hash("calibration-password", rounds)
+            durations.append((time.perf_counter() - started) * 1000)
+        timings.append((rounds, statistics.median(durations)))
+        if timings[-1][1] > target_ms:
+            break
+    return timings
+
+
+hashing_executor = PasswordHashingExecutor(
+    settings.PASSWORD_HASH_EXECUTOR,
+    settings.PASSWORD_HASH_MAX_WORKERS,
+    settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
+password_hasher = PasswordHasher(hashing_executor, settings.PASSWORD_HASH_ROUNDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m src.core.hashing",
+        description="Pick the bcrypt cost that fits a per-hash latency budget on this host.",
+    )
+    parser.add_argument("--target-ms", type=float, default=250)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = calibrate(args.target_ms, args.samples)
+    for rounds, median_ms in timings:
+        print(f"rounds={rounds:<3} median={median_ms:9.1f}ms")
+    within = [rounds for rounds, median_ms in timings if median_ms <= args.target_ms]
+    if within:
+        print(f"PASSWORD_HASH_ROUNDS={within[-1]}")
+    else:
+        print(f"even rounds={timings[0][0]} exceeds {args.target_ms}ms on this host")
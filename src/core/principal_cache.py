@@ -0,0 +1,94 @@
+import asyncio
+import json
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.conf.config import settings
+from src.core.cache import TTLCache
+from src.database.redis_client import redis_client
+from src.entity.models import User
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class PrincipalCache:
+    """Two-tier cache of authenticated users: in-process TTL-LRU over Redis.
+
+    A warm local entry serves ``get_current_user`` without any network
+    round trip. Invalidation drops the local entry, deletes the Redis key
+    and publishes the username on ``CHANNEL`` so that every other worker
+    running :meth:`listen` drops its local copy too. Redis failures are
+    logged and treated as cache misses.
+    """
+
+    CHANNEL = "principal:invalidate"
+
+    def __init__(self, redis: Redis, maxsize: int, local_ttl: int, redis_ttl: int):
+        self.redis = redis
+        self.redis_ttl = redis_ttl
+        self.local = TTLCache(maxsize, local_ttl)
+
+    @staticmethod
+    def key(username: str) -> str:
+        return f"user:{username}"
+
+    def get_local(self, username: str) -> User | None:
+        data = self.local.get(username)
+        return None if data is None else User.from_dict(data)
+
+    def from_cached(self, username: str, cached: bytes | None) -> User | None:
+        """Build a principal from a raw Redis value and keep it locally."""
+        if cached is None:
+            return None
+        data = json.loads(cached)
+        self.local.set(username, data)
+        return User.from_dict(data)
+
+    async def set(self, user: User, ttl: float | None = None) -> None:
+        """Cache a principal in both tiers; ``ttl`` caps how long it is kept."""
+        data = user.to_dict()
+        local_ttl, redis_ttl = self.local.ttl, self.redis_ttl
+        if ttl is not None:
+            local_ttl, redis_ttl = min(local_ttl, ttl), min(redis_ttl, max(1, int(ttl)))
+        self.local.set(user.username, data, ttl=local_ttl)
+        try:
+            await self.redis.setex(self.key(user.username), redis_ttl, json.dumps(data))
+        except RedisError as e:
+            logger.warning(f"Principal cache unavailable: {e}")
+
+    async def invalidate(self, username: str) -> None:
+        self.local.pop(username)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.delete(self.key(username))
+                pipe.publish(self.CHANNEL, username)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Principal cache invalidation failed: {e}")
+
+    async def listen(self, retry_delay: float = 1.0) -> None:
+        """Drop local entries invalidated by other workers. Runs until cancelled."""
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                # Anything published while we were not subscribed is lost.
+                self.local.clear()
+                async for message in pubsub.listen():
+                    self.local.pop(message["data"].decode())
+            except RedisError as e:
+                logger.warning(f"Principal invalidation listener failed: {e}")
+            finally:
+                await pubsub.aclose()
+            self.local.clear()
+            await asyncio.sleep(retry_delay)
+
+
+principal_cache = PrincipalCache(
+    redis_client,
+    settings.PRINCIPAL_CACHE_MAXSIZE,
+    settings.PRINCIPAL_CACHE_LOCAL_TTL,
+    settings.PRINCIPAL_CACHE_REDIS_TTL,
+)
@@ -2,11 +2,9 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
 import  jwt
-from passlib.context import CryptContext
 
 from src.conf.config import settings
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.core.hashing import password_hasher
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -26,11 +24,11 @@ def verify_access_token(token: str) -> Dict[str, Any]:
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
 
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
 
-    return pwd_context.hash(password)
+    return await password_hasher.hash(password)
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.database.redis_client import redis_client
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class TokenRevocationStore:
+    """Local negative-lookup filter over revoked access-token ids (jti).
+
+    Revoked ids live in Redis as ``bl:jti:{jti}`` keys that expire with the
+    token. While :meth:`listen` is running, every worker mirrors those keys
+    in memory: it loads them once at subscribe time and then follows
+    ``CHANNEL``. A jti missing from the mirror was never revoked, so the
+    Redis lookup is skipped. If the mirror is not in sync, every lookup
+    has to go to Redis.
+    """
+
+    CHANNEL = "token:revoked"
+    KEY_PREFIX = "bl:jti:"
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self.synced = False
+        self._revoked: dict[str, float] = {}
+
+    @classmethod
+    def key(cls, jti: str) -> str:
+        return f"{cls.KEY_PREFIX}{jti}"
+
+    @staticmethod
+    def message(jti: str, exp: float) -> str:
+        return f"{jti}:{int(exp)}"
+
+    def remember(self, jti: str, exp: float) -> None:
+        self._revoked[jti] = exp
+
+    def maybe_revoked(self, jti: str) -> bool:
+        if not self.synced:
+            return True
+        exp = self._revoked.get(jti)
+        if exp is None:
+            return False
+        if exp <= time.time():
+            del self._revoked[jti]
+            return False
+        return True
+
+    def _reset(self) -> None:
+        self.synced = False
+        self._revoked.clear()
+
+    async def _load(self) -> None:
+        now = time.time()
+        keys = [key async for key in self.redis.scan_iter(match=f"{self.KEY_PREFIX}*")]
+        if not keys:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.ttl(key)
+            ttls = await pipe.execute()
+        for key, ttl in zip(keys, ttls):
+            if ttl > 0:
+                self.remember(key.decode().removeprefix(self.KEY_PREFIX), now + ttl)
+
+    async def listen(self, retry_delay: float = 1.0) -> None:
+        """Keep the local mirror in sync with Redis. Runs until cancelled."""
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                await self._load()
+                self.synced = True
+                async for message in pubsub.listen():
+                    jti, _, exp = message["data"].decode().rpartition(":")
+                    self.remember(jti, float(exp))
+            except RedisError as e:
+                logger.warning(f"Token revocation listener failed: {e}")
+            finally:
+                self._reset()
+                await pubsub.aclose()
+            await asyncio.sleep(retry_delay)
+
+
+token_revocation = TokenRevocationStore(redis_client)
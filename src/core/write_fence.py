@@ -0,0 +1,50 @@
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.conf.config import settings
+from src.database.redis_client import redis_client
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class WriteFence:
+    """Remembers, for ``window`` seconds, which users have just written.
+
+    Their read-only sessions go to the primary meanwhile, so a user always
+    reads their own writes even while replicas catch up. Kept in Redis so
+    the fence holds across workers. A ``window`` of 0 disables it; if Redis
+    is down every user counts as a recent writer.
+    """
+
+    def __init__(self, redis: Redis, window: float):
+        self.redis = redis
+        self.window = window
+
+    @staticmethod
+    def key(username: str) -> str:
+        return f"db:recent-write:{username}"
+
+    async def mark(self, username: str) -> None:
+        if self.window <= 0:
+            return
+        try:
+            await self.redis.set(self.key(username), 1, px=int(self.window * 1000))
+        except RedisError as e:
+            logger.warning(f"Write fence not set for {username}: {e}")
+
+    async def recent(self, username: str) -> bool:
+        if self.window <= 0:
+            return False
+        try:
+            return bool(await self.redis.exists(self.key(username)))
+        except RedisError as e:
+            logger.warning(f"Write fence unavailable: {e}")
+            return True
+
+
+# replicas are the only reason to track writes
+write_fence = WriteFence(
+    redis_client, settings.DB_REPLICA_STICKY_SECONDS if settings.DB_REPLICA_URLS else 0
+)
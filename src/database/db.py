@@ -1,30 +1,278 @@
+import asyncio
 import contextlib
 import logging
+import time
+from typing import Awaitable, Callable
 
+from sqlalchemy import exc, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.concurrency import await_only, in_greenlet
 
 from src.conf.config import settings
+from src.core.metrics import metrics
 
 logger = logging.getLogger("uvicorn.error")
 
+pool_checkouts = metrics.counter(
+    "db_pool_checkouts_total", "Connections handed out by the database pool."
+)
+pool_wait_seconds = metrics.counter(
+    "db_pool_checkout_wait_seconds_total", "Time spent waiting for a pooled connection."
+)
+pool_timeouts = metrics.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT."
+)
+pool_checked_out = metrics.gauge(
+    "db_pool_checked_out_connections", "Connections currently checked out."
+)
+pool_idle = metrics.gauge("db_pool_idle_connections", "Open connections idle in the pool.")
+replica_reads = metrics.counter(
+    "db_replica_read_sessions_total", "Read-only sessions served by a replica."
+)
+primary_reads = metrics.counter(
+    "db_primary_read_sessions_total",
+    "Read-only sessions sent to the primary: sticky users, or no healthy replica.",
+)
+
+# seconds a replica is behind; 0 wherever there is nothing to replay
+REPLICA_LAG_SQL = {
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    ),
+}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout counts, wait time and occupancy.
+
+    The wait covers everything between asking for a connection and getting
+    one, including opening a new connection when the pool is not yet full.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            pool_timeouts.inc()
+            raise
+        finally:
+            pool_wait_seconds.inc(time.perf_counter() - started)
+        pool_checkouts.inc()
+        self._update_gauges()
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        pool_checked_out.set(self.checkedout())
+        pool_idle.set(self.checkedin())
+
+
+def engine_options(url: str, instrumented: bool = True) -> dict:
+    """Pool and driver arguments for ``create_async_engine`` from settings.
+
+    The pool metrics describe the primary only; replicas pass
+    ``instrumented=False`` so their checkouts are not counted with it.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # in-memory SQLite lives in a single connection; there is nothing to pool
+        return {}
+    options = {
+        "poolclass": InstrumentedQueuePool if instrumented else AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_driver_name() == "asyncpg":
+        # SQLAlchemy prepares every statement itself and keeps the prepared
+        # statements per connection (prepared_statement_cache_size);
+        # asyncpg's own cache covers what it runs directly, such as COPY
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+class RoutingSession(Session):
+    """Session that can defer the choice of its engine to the first statement.
+
+    ``info["route"]`` may hold a coroutine function returning an
+    ``AsyncEngine``; it is awaited the first time the session needs a
+    connection, so a session that never runs a statement costs nothing.
+    Until then ``get_bind`` answers with the default bind, which shares the
+    routed engine's dialect.
+    """
+
+    def get_bind(self, mapper=None, **kw):
+        route = self.info.get("route")
+        if route is not None and in_greenlet():
+            del self.info["route"]
+            self.bind = await_only(route()).sync_engine
+        return super().get_bind(mapper, **kw)
+
+
+class Replica:
+    """A read replica engine and its last known health.
+
+    Health is re-checked at most every ``check_interval`` seconds; a
+    replica is usable while it answers and lags less than ``max_lag``.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_lag: float, check_interval: float, check_timeout: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.healthy = True
+        self.checked_at = float("-inf")
+
+    def mark_down(self) -> None:
+        self.healthy = False
+        self.checked_at = time.monotonic()
+
+    async def available(self) -> bool:
+        if time.monotonic() - self.checked_at >= self.check_interval:
+            # claimed up front so concurrent requests keep the previous
+            # verdict instead of all checking at once
+            self.checked_at = time.monotonic()
+            self.healthy = await self._check()
+        return self.healthy
+
+    async def _check(self) -> bool:
+        sql = REPLICA_LAG_SQL.get(self.engine.dialect.name, "SELECT 0")
+        try:
+            async with asyncio.timeout(self.check_timeout):
+                async with self.engine.connect() as conn:
+                    lag = (await conn.execute(text(sql))).scalar()
+        except (SQLAlchemyError, OSError, TimeoutError) as e:
+            logger.warning(f"Replica {self.engine.url.host} unavailable: {e}")
+            return False
+        if lag > self.max_lag:
+            logger.warning(f"Replica {self.engine.url.host} is {lag:.1f}s behind")
+            return False
+        return True
+
 
 class DatabaseSessionManager:
-    def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url)
+    def __init__(self, url: str, replica_urls: list[str] = (), **engine_kwargs):
+        self._engine: AsyncEngine | None = create_async_engine(
+            url, **(engine_kwargs or engine_options(url))
+        )
+        self._replicas: list[Replica] = [
+            Replica(
+                create_async_engine(
+                    replica_url,
+                    **(engine_kwargs or engine_options(replica_url, instrumented=False)),
+                ),
+                settings.DB_REPLICA_MAX_LAG_SECONDS,
+                settings.DB_REPLICA_CHECK_INTERVAL,
+                settings.DB_REPLICA_CHECK_TIMEOUT,
+            )
+            for replica_url in replica_urls
+        ]
+        self._next_replica = 0
+        # objects stay usable after commit without a refresh round trip
         self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            bind=self._engine,
+            sync_session_class=RoutingSession,
         )
 
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    async def _pick_replica(self) -> Replica | None:
+        """Next available replica in round-robin order, if any."""
+        for _ in range(len(self._replicas)):
+            replica = self._replicas[self._next_replica % len(self._replicas)]
+            self._next_replica += 1
+            if await replica.available():
+                return replica
+        return None
+
+    async def warmup(self, connections: int) -> int:
+        """Open up to ``connections`` pooled connections ahead of the first request.
+
+        Never opens more than the pool keeps, so none are discarded as
+        overflow on return. Returns the number of connections opened.
+        """
+        pool_size = getattr(self._engine.pool, "size", lambda: 0)()
+        count = min(connections, pool_size)
+        if count <= 0:
+            return 0
+        opened = await asyncio.gather(
+            *(self._engine.connect() for _ in range(count)), return_exceptions=True
+        )
+        for conn in opened:
+            if not isinstance(conn, BaseException):
+                await conn.close()
+        failed = [conn for conn in opened if isinstance(conn, BaseException)]
+        if failed:
+            logger.warning(f"Database pool warm-up failed: {failed[0]}")
+        return count - len(failed)
+
+    async def close(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.engine.dispose()
+
+    @contextlib.asynccontextmanager
+    async def read_session(
+        self, primary: bool = False, sticky: Callable[[], Awaitable[bool]] | None = None
+    ):
+        """Session for reads only, on a replica unless ``primary`` is set,
+        ``sticky()`` returns true, or no replica is available.
+
+        The engine is chosen when the first statement runs; a session routed
+        to a replica then has ``info["replica"]`` set. A replica that fails
+        while in use is taken out of rotation until its next check.
+        """
+        replica = None
+
+        async def route():
+            nonlocal replica
+            if self._replicas and not primary and not (sticky and await sticky()):
+                replica = await self._pick_replica()
+            if replica is None:
+                primary_reads.inc()
+                return self._engine
+            replica_reads.inc()
+            session.info["replica"] = True
+            return replica.engine
+
+        try:
+            async with self.session(info={"route": route}) as session:
+                yield session
+        except (exc.OperationalError, exc.InterfaceError):
+            if replica is not None:
+                replica.mark_down()
+            raise
+
     @contextlib.asynccontextmanager
-    async def session(self):
+    async def session(self, **kwargs):
         if self._session_maker is None:
             raise Exception("Database session is not initialized")
-        session = self._session_maker()
+        session = self._session_maker(**kwargs)
         try:
             yield session
         except SQLAlchemyError as e:
@@ -39,7 +287,7 @@ class DatabaseSessionManager:
             await session.close()
 
 
-sessionmanager = DatabaseSessionManager(settings.DB_URL)
+sessionmanager = DatabaseSessionManager(settings.DB_URL, settings.DB_REPLICA_URLS)
 
 
 async def get_db():
@@ -0,0 +1,40 @@
+import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+
+from src.conf.config import settings
+
+
+class InstrumentedPipeline(Pipeline):
+    def __init__(self, client: "InstrumentedRedis", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = client
+
+    async def execute(self, raise_on_error: bool = True):
+        if self.command_stack:
+            self.client.round_trips += 1
+        return await super().execute(raise_on_error)
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client that counts network round trips.
+
+    Every standalone command is one round trip and every non-empty
+    pipeline ``execute`` is one round trip, however many commands it
+    carries. Pub/sub traffic is not counted.
+    """
+
+    round_trips: int = 0
+
+    async def execute_command(self, *args, **options):
+        self.round_trips += 1
+        return await super().execute_command(*args, **options)
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: str | None = None
+    ) -> InstrumentedPipeline:
+        return InstrumentedPipeline(
+            self, self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+redis_client = InstrumentedRedis.from_url(settings.REDIS_URL)
@@ -1,15 +1,20 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from sqlalchemy import (
     String,
+    Integer,
     DateTime,
     func,
     ForeignKey,
     Text,
     Boolean,
     Enum as SqlEnum,
+    Index,
+    DDL,
+    event,
+    literal_column,
 )
-from sqlalchemy.orm import DeclarativeBase, relationship
+from sqlalchemy.orm import DeclarativeBase, relationship, validates
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.conf import constants
@@ -25,6 +30,16 @@ class Base(DeclarativeBase):
     pass
 
 
+def birth_month_day(value: date) -> int:
+    """Month and day of ``value`` as one sortable integer: 14 March -> 314."""
+    return value.month * 100 + value.day
+
+
+def _birth_month_day_default(context) -> int:
+    # covers Core inserts too, which bypass the ORM validator below
+    return birth_month_day(context.get_current_parameters()["date_of_birth"])
+
+
 class Contact_Book(Base):
     __tablename__ = "Contact_Book"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -41,12 +56,112 @@ class Contact_Book(Base):
         String(constants.PHONE_NUMBER_MAX_LENGTH), nullable=False
     )
     date_of_birth: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    birth_month_day: Mapped[int] = mapped_column(
+        Integer, default=_birth_month_day_default, nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=func.now(), onupdate=func.now()
     )
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=True)
-    user: Mapped["User"] = relationship("User", backref="todos", lazy="joined")
+    # never loaded implicitly; use selectinload/joinedload where it is needed
+    user: Mapped["User"] = relationship("User", backref="todos", lazy="raise")
+
+    # keyset pagination walks a user's contacts in id order; upcoming
+    # birthdays are a range scan over month-day
+    __table_args__ = (
+        Index("ix_contact_book_user_id_id", "user_id", "id"),
+        Index("ix_contact_book_user_id_birth_month_day", "user_id", "birth_month_day"),
+    )
+
+    @validates("date_of_birth")
+    def _sync_birth_month_day(self, key, value):
+        if value is not None:
+            self.birth_month_day = birth_month_day(value)
+        return value
+
+
+# Full-text contact search. Postgres indexes the concatenated fields with
+# trigrams; SQLite keeps an FTS5 trigram table in sync through triggers.
+# Queries must search ``contact_search_document``, the same expression the
+# trigram index is built on, for Postgres to use the index.
+CONTACT_SEARCH_DOCUMENT = "(name || ' ' || surname || ' ' || email || ' ' || phone)"
+CONTACT_SEARCH_FTS = "contact_book_fts"
+_space = literal_column("' '")
+contact_search_document = (
+    Contact_Book.name + _space + Contact_Book.surname + _space
+    + Contact_Book.email + _space + Contact_Book.phone
+)
+
+for ddl in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f'CREATE INDEX IF NOT EXISTS ix_contact_book_search_trgm ON "Contact_Book" '
+    f"USING gin ({CONTACT_SEARCH_DOCUMENT} gin_trgm_ops)",
+):
+    event.listen(
+        Contact_Book.__table__, "after_create", DDL(ddl).execute_if(dialect="postgresql")
+    )
+
+for ddl in (
+    f"CREATE VIRTUAL TABLE {CONTACT_SEARCH_FTS} USING fts5(name, surname, email, phone, "
+    f"content='Contact_Book', content_rowid='id', tokenize='trigram')",
+    f'CREATE TRIGGER {CONTACT_SEARCH_FTS}_ai AFTER INSERT ON "Contact_Book" BEGIN '
+    f"INSERT INTO {CONTACT_SEARCH_FTS}(rowid, name, surname, email, phone) "
+    f"VALUES (new.id, new.name, new.surname, new.email, new.phone); END",
+    f'CREATE TRIGGER {CONTACT_SEARCH_FTS}_ad AFTER DELETE ON "Contact_Book" BEGIN '
+    f"INSERT INTO {CONTACT_SEARCH_FTS}({CONTACT_SEARCH_FTS}, rowid, name, surname, email, phone) "
+    f"VALUES ('delete', old.id, old.name, old.surname, old.email, old.phone); END",
+    f'CREATE TRIGGER {CONTACT_SEARCH_FTS}_au AFTER UPDATE ON "Contact_Book" BEGIN '
+    f"INSERT INTO {CONTACT_SEARCH_FTS}({CONTACT_SEARCH_FTS}, rowid, name, surname, email, phone) "
+    f"VALUES ('delete', old.id, old.name, old.surname, old.email, old.phone); "
+    f"INSERT INTO {CONTACT_SEARCH_FTS}(rowid, name, surname, email, phone) "
+    f"VALUES (new.id, new.name, new.surname, new.email, new.phone); END",
+):
+    event.listen(
+        Contact_Book.__table__, "after_create", DDL(ddl).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Contact_Book.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {CONTACT_SEARCH_FTS}").execute_if(dialect="sqlite"),
+)
+
+# users.contacts_count follows inserts and deletes on Contact_Book, including
+# Core bulk statements and COPY. Postgres adjusts it once per statement from
+# the transition table; SQLite only has row triggers. Contacts never change
+# owner, so updates are not tracked.
+CONTACT_COUNT_PG_DDL = (
+    "CREATE OR REPLACE FUNCTION contact_book_count_ins() RETURNS trigger "
+    "LANGUAGE plpgsql AS $$ BEGIN "
+    "UPDATE users SET contacts_count = users.contacts_count + n.c "
+    "FROM (SELECT user_id, count(*) AS c FROM new_rows GROUP BY user_id) n "
+    "WHERE users.id = n.user_id; RETURN NULL; END $$",
+    "CREATE OR REPLACE FUNCTION contact_book_count_del() RETURNS trigger "
+    "LANGUAGE plpgsql AS $$ BEGIN "
+    "UPDATE users SET contacts_count = users.contacts_count - o.c "
+    "FROM (SELECT user_id, count(*) AS c FROM old_rows GROUP BY user_id) o "
+    "WHERE users.id = o.user_id; RETURN NULL; END $$",
+    'CREATE TRIGGER contact_book_count_ins AFTER INSERT ON "Contact_Book" '
+    "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT "
+    "EXECUTE FUNCTION contact_book_count_ins()",
+    'CREATE TRIGGER contact_book_count_del AFTER DELETE ON "Contact_Book" '
+    "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT "
+    "EXECUTE FUNCTION contact_book_count_del()",
+)
+CONTACT_COUNT_SQLITE_DDL = (
+    'CREATE TRIGGER contact_book_count_ai AFTER INSERT ON "Contact_Book" BEGIN '
+    "UPDATE users SET contacts_count = contacts_count + 1 WHERE id = new.user_id; END",
+    'CREATE TRIGGER contact_book_count_ad AFTER DELETE ON "Contact_Book" BEGIN '
+    "UPDATE users SET contacts_count = contacts_count - 1 WHERE id = old.user_id; END",
+)
+for ddl in CONTACT_COUNT_PG_DDL:
+    event.listen(
+        Contact_Book.__table__, "after_create", DDL(ddl).execute_if(dialect="postgresql")
+    )
+for ddl in CONTACT_COUNT_SQLITE_DDL:
+    event.listen(
+        Contact_Book.__table__, "after_create", DDL(ddl).execute_if(dialect="sqlite")
+    )
 
 
 class User(Base):
@@ -63,6 +178,13 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(
         SqlEnum(UserRole), default=UserRole.USER, nullable=False
     )
+    token_epoch: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # maintained by triggers on Contact_Book, never written by the application
+    contacts_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
     def to_dict(self):
         return {
@@ -73,7 +195,7 @@ class User(Base):
             "avatar": self.avatar,
             "confirmed": self.confirmed,
             "role": self.role.value,
-
+            "token_epoch": self.token_epoch,
         }
 
     @classmethod
@@ -86,21 +208,26 @@ class User(Base):
         user.avatar = data["avatar"]
         user.confirmed = data["confirmed"]
         user.role = UserRole(data["role"])
+        user.token_epoch = data.get("token_epoch", 0)
         return user
 
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id"), nullable=False, index=True
+    )
     token_hash: Mapped[str] = mapped_column(nullable=False, unique=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=func.now(), nullable=False
     )
     expired_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
     )
-    revoked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
     ip_address: Mapped[str] = mapped_column(String(50), nullable=True)
     user_agent: Mapped[str] = mapped_column(Text, nullable=True)
 
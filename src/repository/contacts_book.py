@@ -1,14 +1,54 @@
+import calendar
 import logging
-from typing import Sequence
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import (
+    bindparam,
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    table,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.entity.models import Contact_Book, User
-from src.schemas.contact_book import ContactBookSchema, ContactBookUpdateSchema, ContactBookResponse
+from src.core.contacts_version import contacts_version
+from src.core.write_fence import write_fence
+from src.entity.models import (
+    CONTACT_SEARCH_FTS,
+    Contact_Book,
+    User,
+    birth_month_day,
+    contact_search_document,
+)
+from src.schemas.contact_book import (
+    ContactBookSchema,
+    ContactBookUpdateSchema,
+    ContactBookResponse,
+    ContactBulkFilter,
+)
 
 logger = logging.getLogger("uvicorn.error")
 
+# built once, see _user_by_username in user_repository
+_contact_by_id = select(Contact_Book).where(
+    Contact_Book.id == bindparam("contact_id"),
+    Contact_Book.user_id == bindparam("user_id"),
+)
+
+
+def _with_birth_month_day(values: dict) -> dict:
+    # UPDATE statements bypass the ORM validator that keeps it in step
+    if values.get("date_of_birth") is None:
+        return values
+    return {**values, "birth_month_day": birth_month_day(values["date_of_birth"])}
+
 
 class ContactBookRepository:
     """Repository class for managing contact book operations in the database.
@@ -29,21 +69,135 @@ class ContactBookRepository:
         """
         self.db = session
 
-    async def get_contact(self, limit: int, offset: int, user: User) -> Sequence[Contact_Book]:
-        """Retrieve a paginated list of contacts for a specific user.
+    async def _changed(self, user: User) -> None:
+        # after commit: invalidate cached reads and keep the user's reads on the primary
+        await contacts_version.bump(user.id)
+        await write_fence.mark(user.username)
+
+    async def get_contact(
+            self, limit: int, offset: int, user: User, after_id: int | None = None
+    ) -> Sequence[Contact_Book]:
+        """Retrieve a paginated list of contacts for a specific user, ordered by id.
+
+        With ``after_id`` the page starts right after that contact (keyset
+        pagination over the ``(user_id, id)`` index), so every page costs
+        the same however deep it is. Otherwise ``offset`` rows are skipped.
 
         Args:
             limit (int): Maximum number of contacts to return.
             offset (int): Number of contacts to skip for pagination.
             user (User): The user whose contacts to retrieve.
+            after_id (int | None): ID of the last contact on the previous page.
 
         Returns:
             Sequence[Contact_Book]: A list of contact book entries.
         """
-        stmt = select(Contact_Book).filter_by(user_id = user.id).offset(offset).limit(limit)
+        stmt = select(Contact_Book).filter_by(user_id = user.id).order_by(Contact_Book.id)
+        if after_id is not None:
+            stmt = stmt.where(Contact_Book.id > after_id)
+        else:
+            stmt = stmt.offset(offset)
+        stmt = stmt.limit(limit)
         contact = await self.db.execute(stmt)
         return contact.scalars().all()
 
+    async def stream_contacts(
+            self, user: User, batch_size: int
+    ) -> AsyncIterator[Sequence[Contact_Book]]:
+        """Yield all of a user's contacts in id order, ``batch_size`` at a time.
+
+        Rows are read through a server-side cursor (``stream_scalars``), so
+        only one batch is held in memory at once.
+
+        Args:
+            user (User): The user whose contacts to read.
+            batch_size (int): Number of contacts fetched per batch.
+
+        Yields:
+            Sequence[Contact_Book]: The next batch of contacts.
+        """
+        stmt = (
+            select(Contact_Book)
+            .filter_by(user_id=user.id)
+            .order_by(Contact_Book.id)
+            .execution_options(yield_per=batch_size)
+        )
+        contacts = await self.db.stream_scalars(stmt)
+        async for batch in contacts.partitions():
+            yield batch
+
+    async def search_contacts(self, query: str, limit: int, user: User) -> Sequence[Contact_Book]:
+        """Find a user's contacts whose name, surname, email or phone contains ``query``.
+
+        Matches are case-insensitive substrings served from the trigram
+        search index (``pg_trgm`` on Postgres, FTS5 on SQLite) and come back
+        best match first.
+
+        Args:
+            query (str): Text to look for, at least three characters long.
+            limit (int): Maximum number of contacts to return.
+            user (User): The user whose contacts to search.
+
+        Returns:
+            Sequence[Contact_Book]: Matching contacts ordered by relevance.
+        """
+        stmt = select(Contact_Book).filter_by(user_id=user.id)
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            fts = literal_column(CONTACT_SEARCH_FTS)
+            fts_table = table(CONTACT_SEARCH_FTS, column("rowid"))
+            phrase = '"' + query.replace('"', '""') + '"'
+            stmt = (
+                stmt.join(fts_table, fts_table.c.rowid == Contact_Book.id)
+                .where(fts.op("MATCH")(phrase))
+                .order_by(func.bm25(fts), Contact_Book.id)
+            )
+        else:
+            document = contact_search_document
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            stmt = stmt.where(document.ilike(pattern, escape="\\"))
+            if dialect == "postgresql":
+                stmt = stmt.order_by(func.word_similarity(query, document).desc(), Contact_Book.id)
+            else:
+                stmt = stmt.order_by(Contact_Book.id)
+        contacts = await self.db.execute(stmt.limit(limit))
+        return contacts.scalars().all()
+
+    async def get_upcoming_birthdays(
+            self, days: int, user: User, today: date
+    ) -> Sequence[Contact_Book]:
+        """Retrieve a user's contacts with a birthday within ``days`` days of ``today``.
+
+        The window is a range over the indexed ``birth_month_day`` column,
+        split in two when it wraps past 31 December. A 29 February birthday
+        is celebrated on 28 February in common years.
+
+        Args:
+            days (int): Length of the window in days; 0 means today only.
+            user (User): The user whose contacts to check.
+            today (date): First day of the window.
+
+        Returns:
+            Sequence[Contact_Book]: Contacts ordered by upcoming birthday.
+        """
+        end_date = today + timedelta(days=days)
+        start, end = birth_month_day(today), birth_month_day(end_date)
+        month_day = Contact_Book.birth_month_day
+        stmt = select(Contact_Book).filter_by(user_id=user.id)
+        if days < 365:
+            if start <= end:
+                in_window = month_day.between(start, end)
+            else:
+                in_window = or_(month_day >= start, month_day <= end)
+            if (end_date.month, end_date.day) == (2, 28) and not calendar.isleap(end_date.year):
+                in_window = or_(in_window, month_day == 229)
+            stmt = stmt.where(in_window)
+        stmt = stmt.order_by(
+            case((month_day < start, 1), else_=0), month_day, Contact_Book.id
+        )
+        contacts = await self.db.execute(stmt)
+        return contacts.scalars().all()
+
     async def get_contact_by_id(self, contact_id: int, user: User) -> Contact_Book | None:
         """Retrieve a specific contact by its ID for a given user.
 
@@ -54,10 +208,37 @@ class ContactBookRepository:
         Returns:
             Contact_Book | None: The contact if found, None otherwise.
         """
-        stmt = select(Contact_Book).filter_by(id=contact_id, user_id = user.id)
-        contact = await self.db.execute(stmt)
+        contact = await self.db.execute(
+            _contact_by_id, {"contact_id": contact_id, "user_id": user.id}
+        )
         return contact.scalar_one_or_none()
 
+    async def count_contacts(self, user: User) -> int:
+        """Number of contacts a user owns.
+
+        Reads the trigger-maintained ``users.contacts_count``, so the cost
+        does not grow with the size of the contact book.
+
+        Args:
+            user (User): The user who owns the contacts.
+
+        Returns:
+            int: The user's contact count.
+        """
+        stmt = select(User.contacts_count).where(User.id == user.id)
+        count = await self.db.execute(stmt)
+        return count.scalar_one_or_none() or 0
+
+    async def count_all_contacts(self) -> int:
+        """Number of contacts across all users, summed from the per-user counts.
+
+        Returns:
+            int: Total contact count.
+        """
+        stmt = select(func.coalesce(func.sum(User.contacts_count), 0))
+        count = await self.db.execute(stmt)
+        return count.scalar_one()
+
     async def create_contact(self, body: ContactBookSchema, user: User) -> Contact_Book:
         """Create a new contact for a user.
 
@@ -68,12 +249,54 @@ class ContactBookRepository:
         Returns:
             Contact_Book: The newly created contact.
         """
-        contact = Contact_Book(**body.model_dump(), user=user)
-        self.db.add(contact)
+        stmt = (
+            insert(Contact_Book)
+            .values(**body.model_dump(), user_id=user.id)
+            .returning(Contact_Book)
+        )
+        contact = await self.db.execute(stmt)
+        contact = contact.scalar_one()
         await self.db.commit()
-        await self.db.refresh(contact)
+        await self._changed(user)
         return contact
 
+    async def create_contacts(self, rows: list[dict], user: User) -> int:
+        """Insert many contacts for a user in one round trip and commit.
+
+        Uses ``COPY`` on asyncpg and a multi-row ``INSERT`` elsewhere.
+
+        Args:
+            rows (list[dict]): Validated ``ContactBookSchema`` dumps.
+            user (User): The user who will own the contacts.
+
+        Returns:
+            int: Number of contacts inserted.
+        """
+        if self.db.get_bind().dialect.driver == "asyncpg":
+            await self._copy_contacts(rows, user)
+        else:
+            await self.db.execute(
+                insert(Contact_Book), [{**row, "user_id": user.id} for row in rows]
+            )
+        await self.db.commit()
+        await self._changed(user)
+        return len(rows)
+
+    async def _copy_contacts(self, rows: list[dict], user: User) -> None:
+        # COPY skips SQLAlchemy defaults, so every column is supplied here
+        fields = list(ContactBookSchema.model_fields)
+        columns = [*fields, "birth_month_day", "created_at", "updated_at", "user_id"]
+        now = datetime.now()
+        records = [
+            (*(row[field] for field in fields), birth_month_day(row["date_of_birth"]), now, now, user.id)
+            for row in rows
+        ]
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Contact_Book.__tablename__, records=records, columns=columns
+        )
+
     async def remove_contact(self, contact_id: int ,user: User) -> Contact_Book | None:
         """Remove a contact by its ID for a specific user.
 
@@ -84,10 +307,16 @@ class ContactBookRepository:
         Returns:
             Contact_Book | None: The removed contact if found and deleted, None otherwise.
         """
-        contact = await self.get_contact_by_id(contact_id, user)
+        stmt = (
+            delete(Contact_Book)
+            .filter_by(id=contact_id, user_id=user.id)
+            .returning(Contact_Book)
+        )
+        contact = await self.db.execute(stmt)
+        contact = contact.scalar_one_or_none()
         if contact:
-            await self.db.delete(contact)
             await self.db.commit()
+            await self._changed(user)
         return contact
 
     async def update_contact(
@@ -103,14 +332,95 @@ class ContactBookRepository:
         Returns:
             Contact_Book: The updated contact if found, None otherwise.
         """
-        contact = await self.get_contact_by_id(contact_id, user)
+        update_data = body.model_dump(exclude_unset=True)
+        if not update_data:
+            return await self.get_contact_by_id(contact_id, user)
+        stmt = (
+            update(Contact_Book)
+            .filter_by(id=contact_id, user_id=user.id)
+            .values(**_with_birth_month_day(update_data))
+            .returning(Contact_Book)
+            .execution_options(synchronize_session=False)
+        )
+        contact = await self.db.execute(stmt)
+        contact = contact.scalar_one_or_none()
         if contact:
-            update_data = body.model_dump(exclude_unset=True)
+            await self.db.commit()
+            await self._changed(user)
+        return contact
 
-            for key, value in update_data.items():
-                setattr(contact, key, value)
+    def _bulk_criteria(
+            self, user: User, ids: list[int] | None, filters: ContactBulkFilter | None
+    ) -> list:
+        criteria = [Contact_Book.user_id == user.id]
+        if ids is not None:
+            criteria.append(Contact_Book.id.in_(ids))
+        if filters is not None:
+            criteria.extend(
+                getattr(Contact_Book, field) == value
+                for field, value in filters.model_dump(exclude_none=True).items()
+            )
+        return criteria
 
-            await self.db.commit()
-            await self.db.refresh(contact)
+    async def update_contacts(
+            self,
+            values: dict,
+            user: User,
+            ids: list[int] | None = None,
+            filters: ContactBulkFilter | None = None,
+    ) -> list[int]:
+        """Apply the same changes to many of a user's contacts in one statement.
 
-        return contact
+        Args:
+            values (dict): Column values to set.
+            user (User): The user who owns the contacts.
+            ids (list[int] | None): Contacts to change.
+            filters (ContactBulkFilter | None): Exact-match criteria selecting
+                the contacts to change, used instead of ``ids``.
+
+        Returns:
+            list[int]: IDs of the contacts that were updated.
+        """
+        stmt = (
+            update(Contact_Book)
+            .where(*self._bulk_criteria(user, ids, filters))
+            .values(**_with_birth_month_day(values))
+            .returning(Contact_Book.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        updated = sorted(result.scalars().all())
+        await self.db.commit()
+        if updated:
+            await self._changed(user)
+        return updated
+
+    async def remove_contacts(
+            self,
+            user: User,
+            ids: list[int] | None = None,
+            filters: ContactBulkFilter | None = None,
+    ) -> list[int]:
+        """Delete many of a user's contacts in one statement.
+
+        Args:
+            user (User): The user who owns the contacts.
+            ids (list[int] | None): Contacts to delete.
+            filters (ContactBulkFilter | None): Exact-match criteria selecting
+                the contacts to delete, used instead of ``ids``.
+
+        Returns:
+            list[int]: IDs of the contacts that were deleted.
+        """
+        stmt = (
+            delete(Contact_Book)
+            .where(*self._bulk_criteria(user, ids, filters))
+            .returning(Contact_Book.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        removed = sorted(result.scalars().all())
+        await self.db.commit()
+        if removed:
+            await self._changed(user)
+        return removed
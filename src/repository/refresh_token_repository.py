@@ -2,15 +2,22 @@ import logging
 from datetime import datetime
 
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.entity.models import RefreshToken
+from src.entity.models import RefreshToken, User
 from src.repository.base import BaseRepository
 
 
 logger = logging.getLogger("uvicorn.error")
 
+# built once, see _user_by_username in user_repository
+_active_token = select(RefreshToken).where(
+    RefreshToken.token_hash == bindparam("token_hash"),
+    RefreshToken.expired_at > bindparam("current_time"),
+    RefreshToken.revoked_at.is_(None),
+)
+
 
 class RefreshTokenRepository(BaseRepository):
     def __init__(self, session: AsyncSession):
@@ -24,12 +31,9 @@ class RefreshTokenRepository(BaseRepository):
     async def get_active_token(
         self, token_hash: str, current_time: datetime
     ) -> RefreshToken | None:
-        stmt = select(self.model).where(
-            RefreshToken.token_hash == token_hash,
-            RefreshToken.expired_at > current_time,
-            RefreshToken.revoked_at.is_(None),
+        token = await self.db.execute(
+            _active_token, {"token_hash": token_hash, "current_time": current_time}
         )
-        token = await self.db.execute(stmt)
         return token.scalars().first()
 
     async def save_token(
@@ -49,6 +53,131 @@ class RefreshTokenRepository(BaseRepository):
         )
         return await self.create(refresh_token)
 
+    async def rotate_token(
+        self,
+        token_hash: str,
+        new_token_hash: str,
+        expired_at: datetime,
+        ip_address: str | None,
+        user_agent: str | None,
+        current_time: datetime,
+    ) -> tuple[str, int] | None:
+        """
+        Revoke an active token and issue its replacement in one transaction.
+
+        The guarded UPDATE ... RETURNING claims the old token; a concurrent
+        rotation of the same token matches no row and gets None. Returns the
+        owner's username and token epoch, read before the commit expires them.
+
+        On Postgres the claim, the insert and the owner lookup are a single
+        statement; SQLite allows no writes inside a CTE, so there they run
+        one after another in the same transaction.
+        """
+        stmt = (
+            update(self.model)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.expired_at > current_time,
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(revoked_at=current_time)
+            .returning(RefreshToken.user_id)
+        )
+        if self.db.get_bind().dialect.name == "postgresql":
+            return await self._rotate_in_one_statement(
+                stmt.cte("claimed"), new_token_hash, expired_at, ip_address, user_agent
+            )
+
+        result = await self.db.execute(stmt)
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            await self.db.rollback()
+            return None
+
+        user = await self.db.execute(
+            select(User.username, User.token_epoch).where(User.id == user_id)
+        )
+        user = user.one_or_none()
+        if user is None:
+            await self.db.rollback()
+            return None
+
+        self.db.add(
+            RefreshToken(
+                user_id=user_id,
+                token_hash=new_token_hash,
+                expired_at=expired_at,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+        )
+        await self.db.commit()
+        return user.username, user.token_epoch
+
+    async def _rotate_in_one_statement(
+        self,
+        claimed,
+        new_token_hash: str,
+        expired_at: datetime,
+        ip_address: str | None,
+        user_agent: str | None,
+    ) -> tuple[str, int] | None:
+        columns = RefreshToken.__table__.c
+        values = {
+            "token_hash": new_token_hash,
+            "expired_at": expired_at,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        }
+        issued = (
+            insert(self.model)
+            .from_select(
+                ["user_id", *values],
+                select(
+                    claimed.c.user_id,
+                    *(literal(value, columns[name].type) for name, value in values.items()),
+                ),
+            )
+            .returning(RefreshToken.user_id)
+            .cte("issued")
+        )
+        result = await self.db.execute(
+            select(User.username, User.token_epoch).join(issued, User.id == issued.c.user_id)
+        )
+        user = result.one_or_none()
+        if user is None:
+            await self.db.rollback()
+            return None
+        await self.db.commit()
+        return user.username, user.token_epoch
+
     async def revoke_token(self, refresh_token: RefreshToken) -> None:
         refresh_token.revoked_at = datetime.now()
-        await self.db.commit()
\ No newline at end of file
+        await self.db.commit()
+
+    async def revoke_all_for_user(self, user_id: int) -> None:
+        stmt = (
+            update(self.model)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.now())
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def _delete_batch(self, *criteria, batch_size: int) -> int:
+        batch = select(RefreshToken.id).where(*criteria).limit(batch_size)
+        result = await self.db.execute(
+            delete(self.model).where(RefreshToken.id.in_(batch))
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def delete_expired_batch(self, current_time: datetime, batch_size: int) -> int:
+        return await self._delete_batch(
+            RefreshToken.expired_at < current_time, batch_size=batch_size
+        )
+
+    async def delete_revoked_batch(self, cutoff: datetime, batch_size: int) -> int:
+        return await self._delete_batch(
+            RefreshToken.revoked_at < cutoff, batch_size=batch_size
+        )
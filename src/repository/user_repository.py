@@ -1,22 +1,34 @@
 import logging
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.principal_cache import principal_cache
+from src.core.write_fence import write_fence
 from src.entity.models import User
 from src.repository.base import BaseRepository
 from src.schemas.user import UserCreate
 
 logger = logging.getLogger("uvicorn.error")
 
+# built once: the statement's cache key is memoized, so a call only binds
+# values instead of constructing and cache-keying a new select()
+_user_by_username = select(User).where(User.username == bindparam("username"))
+
 
 class UserRepository(BaseRepository):
     def __init__(self, session: AsyncSession):
         super().__init__(session, User)
 
+    async def _changed(self, username: str) -> None:
+        # after commit: keep the user's reads on the primary, then drop cached
+        # copies; in the other order a read still routed to a lagging replica
+        # could cache the old row again after the drop
+        await write_fence.mark(username)
+        await principal_cache.invalidate(username)
+
     async def get_by_username(self, username: str) -> User | None:
-        stmt = select(self.model).where(self.model.username == username)
-        user = await self.db.execute(stmt)
+        user = await self.db.execute(_user_by_username, {"username": username})
         return user.scalar_one_or_none()
 
     async def get_user_by_email(self, email: str) -> User | None:
@@ -36,13 +48,17 @@ class UserRepository(BaseRepository):
 
     async def confirmed_email(self, email: str) -> None:
         user = await self.get_user_by_email(email)
+        username = user.username
         user.confirmed = True
         await self.db.commit()
+        await self._changed(username)
 
     async def update_avatar_url(self, email: str, url: str) -> User:
         user = await self.get_user_by_email(email)
+        username = user.username
         user.avatar = url
         await self.db.commit()
+        await self._changed(username)
         await self.db.refresh(user)
         return user
 
@@ -50,7 +66,26 @@ class UserRepository(BaseRepository):
         """
         Update user's password with a new hashed password
         """
+        username = user.username
         user.hash_password = new_password_hash
         await self.db.commit()
+        await self._changed(username)
         await self.db.refresh(user)
-        return user
\ No newline at end of file
+        return user
+
+    async def bump_token_epoch(self, user: User) -> int:
+        """
+        Invalidate every access token issued to the user so far
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id == user.id)
+            .values(token_epoch=self.model.token_epoch + 1)
+            .returning(self.model.token_epoch)
+        )
+        username = user.username
+        result = await self.db.execute(stmt)
+        token_epoch = result.scalar_one()
+        await self.db.commit()
+        await self._changed(username)
+        return token_epoch
@@ -47,7 +47,7 @@ async def login(
     auth_service: AuthService = Depends(get_auth_service),
 ):
     user = await auth_service.authenticate(form_data.username, form_data.password)
-    access_token = auth_service.create_access_token(user.username)
+    access_token = auth_service.create_access_token(user.username, user.token_epoch)
     refresh_token = await auth_service.create_refresh_token(
         user.id,
         ip_address=request.client.host if request else None,
@@ -64,16 +64,12 @@ async def refresh(
     request: Request = None,
     auth_service: AuthService = Depends(get_auth_service),
 ):
-    user = await auth_service.validate_refresh_token(refresh_token.refresh_token)
-
-    new_access_token = auth_service.create_access_token(user.username)
-    new_refresh_token = await auth_service.create_refresh_token(
-        user.id,
+    username, token_epoch, new_refresh_token = await auth_service.rotate_refresh_token(
+        refresh_token.refresh_token,
         ip_address=request.client.host if request else None,
         user_agent=request.headers.get("user-agent") if request else None,
     )
-
-    await auth_service.revoke_refresh_token(refresh_token.refresh_token)
+    new_access_token = auth_service.create_access_token(username, token_epoch)
 
     return TokenResponse(
         access_token=new_access_token,
@@ -91,3 +87,13 @@ async def logout(
     await auth_service.revoke_access_token(token)
     await auth_service.revoke_refresh_token(refresh_token.refresh_token)
     return None
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    token: str = Depends(oauth2_scheme),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    user = await auth_service.get_current_user(token)
+    await auth_service.revoke_all_tokens(user)
+    return None
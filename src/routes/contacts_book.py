@@ -1,45 +1,201 @@
 import logging
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.depend_service import get_current_user
+from src.core.contacts_version import contacts_version
+from src.core.depend_service import (
+    get_admin_reader,
+    get_current_reader,
+    get_current_user,
+    get_read_db,
+)
+from src.core.etag import etag_matches, weak_etag
+from src.core.pagination import decode_cursor, encode_cursor
 from src.database.db import get_db
 from src.entity.models import User
+from src.services.contact_export import MEDIA_TYPES, ContactExportService
+from src.services.contact_import import ContactImportService
 from src.services.contacts_book import ContactBookService
 from src.schemas.contact_book import (
     ContactBookResponse,
 ContactBookUpdateSchema,
-ContactBookSchema
+ContactBookSchema,
+ContactImportReport,
+ContactBulkSelection,
+ContactBulkUpdate,
+ContactBulkResult,
+ContactStats,
 )
 
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 logger = logging.getLogger("uvicorn.error")
+# clients may cache contact reads but must revalidate them with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str, if_none_match: str | None) -> Response | None:
+    """A 304 response if ``If-None-Match`` matches ``etag``."""
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+    return None
 
 
 @router.get("/", response_model=list[ContactBookResponse])
 async def get_contacts(
+    request: Request,
     limit: int = Query(10, ge=10, le=500),
     offset: int = Query(0, ge=0),
+    after: str | None = Query(None, description="Cursor from the X-Next-Cursor header"),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_reader),
+):
+    if after is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either offset or after, not both",
+        )
+    after_id = decode_cursor(after) if after is not None else None
+    # the page is fresh as long as the user's collection version is the
+    # same, so a revalidation is answered without querying the contacts
+    version = await contacts_version.get(user.id)
+    headers = {}
+    if version is not None:
+        etag = weak_etag("contacts", user.id, version, request.url.query)
+        if unchanged := not_modified(etag, if_none_match):
+            return unchanged
+        headers = cache_headers(etag)
+    contact_service = ContactBookService(db)
+    # already serialized (and possibly from the cache), so sent as is
+    page, total = await contact_service.get_contacts_cached(limit, offset, user, after_id, version)
+    headers["X-Total-Count"] = str(total)
+    if len(page) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(page[-1]["id"])
+    return JSONResponse(page, headers=headers)
+
+
+@router.get("/stats", response_model=ContactStats)
+async def get_contact_stats(
+    db: AsyncSession = Depends(get_read_db), user: User = Depends(get_current_reader),
+):
+    contact_service = ContactBookService(db)
+    return {"total": await contact_service.count_contacts(user)}
+
+
+@router.get("/stats/all", response_model=ContactStats)
+async def get_all_contact_stats(
+    db: AsyncSession = Depends(get_read_db), user: User = Depends(get_admin_reader),
+):
+    contact_service = ContactBookService(db)
+    return {"total": await contact_service.count_all_contacts()}
+
+
+@router.get("/search", response_model=list[ContactBookResponse])
+async def search_contacts(
+    q: str = Query(..., min_length=3, max_length=100, description="Part of a name, surname, email or phone"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_reader),
+):
+    contact_service = ContactBookService(db)
+    return await contact_service.search_contacts(q, limit, user)
+
+
+@router.get("/birthdays", response_model=list[ContactBookResponse])
+async def get_upcoming_birthdays(
+    days: int = Query(7, ge=0, le=365),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_reader),
+):
+    contact_service = ContactBookService(db)
+    return await contact_service.get_upcoming_birthdays(days, user)
+
+
+@router.post("/bulk-update", response_model=ContactBulkResult)
+async def update_contacts(
+    body: ContactBulkUpdate, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user),
+):
+    contact_service = ContactBookService(db)
+    return {"ids": await contact_service.update_contacts(body, user)}
+
+
+@router.post("/bulk-delete", response_model=ContactBulkResult)
+async def delete_contacts(
+    body: ContactBulkSelection, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user),
+):
+    contact_service = ContactBookService(db)
+    return {"ids": await contact_service.remove_contacts(body, user)}
+
+
+@router.post("/import", response_model=ContactImportReport)
+async def import_contacts(
+    request: Request,
+    fmt: Literal["csv", "ndjson"] = Query("csv", alias="format"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    contact_service = ContactBookService(db)
-    return await contact_service.get_contacts(limit, offset, user)
+    """Import contacts from a raw CSV or NDJSON request body.
+
+    Valid rows are stored, invalid ones are listed by line number.
+    """
+    import_service = ContactImportService(db)
+    return await import_service.import_contacts(request.stream(), fmt, user)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_contacts(
+    fmt: Literal["csv", "ndjson"] = Query("ndjson", alias="format"),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_reader),
+):
+    export_service = ContactExportService(db)
+    return StreamingResponse(
+        export_service.export_contacts(fmt, user),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="contacts.{fmt}"'},
+    )
 
 
 @router.get(
     "/{contact_id}",
     response_model=ContactBookResponse,
 )
-async def get_contact(contact_id: int, db: AsyncSession = Depends(get_db),  user: User = Depends(get_current_user),):
+async def get_contact(
+    contact_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_reader),
+):
+    # any contact write bumps the collection version, so with Redis up the
+    # ETag is known before the row is read; otherwise it comes from updated_at
     contact_service = ContactBookService(db)
-    contact = await contact_service.get_contact(contact_id, user)
+    version = await contacts_version.get(user.id)
+    if version is not None:
+        etag = weak_etag("contact", user.id, contact_id, version)
+        if unchanged := not_modified(etag, if_none_match):
+            return unchanged
+        contact = await contact_service.get_contact_cached(contact_id, user, version)
+    else:
+        contact = await contact_service.get_contact(contact_id, user)
     if contact is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
         )
+    if version is not None:
+        return JSONResponse(contact, headers=cache_headers(etag))
+    etag = weak_etag("contact", contact.id, contact.updated_at.isoformat())
+    if unchanged := not_modified(etag, if_none_match):
+        return unchanged
+    response.headers.update(cache_headers(etag))
     return contact
 
 
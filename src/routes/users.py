@@ -15,6 +15,7 @@ from slowapi.util import get_remote_address
 from src.conf.config import settings
 from src.core.depend_service import (
     get_auth_service,
+    get_read_auth_service,
     get_user_service,
     get_admin_user,
 )
@@ -37,7 +38,7 @@ limiter = Limiter(key_func=get_remote_address)
 async def me(
     request: Request,
     token: str = Depends(oauth2_scheme),
-    auth_service: AuthService = Depends(get_auth_service),
+    auth_service: AuthService = Depends(get_read_auth_service),
 ):
     return await auth_service.get_current_user(token)
 
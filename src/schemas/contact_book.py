@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, model_validator
 
 from src.conf import constants
 from src.conf import messages
@@ -29,3 +29,57 @@ class ContactBookResponse(BaseModel):
     date_of_birth: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class ContactImportError(BaseModel):
+    line: int
+    errors: list[str]
+
+class ContactImportReport(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: list[ContactImportError] = []
+    errors_truncated: bool = False
+
+class ContactBookPatchSchema(BaseModel):
+    name: Optional[str] = Field(None, min_length=constants.USER_NAME_MIN_LENGTH, max_length=constants.USER_NAME_MAX_LENGTH)
+    surname: Optional[str] = Field(None, min_length=constants.USER_SURNAME_MIN_LENGTH, max_length=constants.USER_SURNAME_MAX_LENGTH)
+    email: Optional[EmailStr] = None
+    phone: Optional[str] = None
+    date_of_birth: Optional[datetime] = None
+
+class ContactBulkFilter(BaseModel):
+    name: Optional[str] = None
+    surname: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+
+    @model_validator(mode="after")
+    def not_empty(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("filter needs at least one field")
+        return self
+
+class ContactBulkSelection(BaseModel):
+    ids: Optional[list[int]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[ContactBulkFilter] = None
+
+    @model_validator(mode="after")
+    def ids_or_filter(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("pass either ids or filter")
+        return self
+
+class ContactBulkUpdate(ContactBulkSelection):
+    changes: ContactBookPatchSchema
+
+    @model_validator(mode="after")
+    def has_changes(self):
+        if not self.changes.model_dump(exclude_none=True):
+            raise ValueError("changes must set at least one field")
+        return self
+
+class ContactBulkResult(BaseModel):
+    ids: list[int]
+
+class ContactStats(BaseModel):
+    total: int
@@ -1,25 +1,32 @@
 from datetime import datetime, timedelta, UTC, timezone
 import secrets
+import time
+import uuid
 
 import jwt
-import bcrypt
 import hashlib
-import redis.asyncio as redis
+import logging
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
+from redis.exceptions import RedisError
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from libgravatar import Gravatar
 
 from src.conf.config import settings
+from src.core.cache import TTLCache
+from src.core.hashing import password_hasher
+from src.core.principal_cache import principal_cache
+from src.core.token_revocation import token_revocation
+from src.database.redis_client import redis_client
 from src.entity.models import User
 from src.repository.refresh_token_repository import RefreshTokenRepository
 from src.repository.user_repository import UserRepository
 from src.schemas.user import UserCreate
-import json
 
-redis_client = redis.from_url(settings.REDIS_URL)
+logger = logging.getLogger("uvicorn.error")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# Verified JWT payloads keyed by token digest; each entry lives until the token's exp.
+access_token_cache = TTLCache(settings.ACCESS_TOKEN_CACHE_SIZE, 0)
 
 
 class AuthService:
@@ -28,15 +35,13 @@ class AuthService:
         self.user_repository = UserRepository(self.db)
         self.refresh_token_repository = RefreshTokenRepository(self.db)
 
-    def _hash_password(self, password: str) -> str:  # noqa
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password.encode(), salt)
-        return hashed_password.decode()
+    async def _hash_password(self, password: str) -> str:  # noqa
+        return await password_hasher.hash(password)
 
-    def _verify_password(
+    async def _verify_password(
         self, plain_password: str, hashed_password: str
     ) -> bool:  # noqa
-        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        return await password_hasher.verify(plain_password, hashed_password)
 
     def _hash_token(self, token: str):  # noqa
         return hashlib.sha256(token.encode()).hexdigest()
@@ -55,13 +60,20 @@ class AuthService:
                 detail="Електронна адреса не підтверджена",
             )
 
-        if not self._verify_password(password, user.hash_password):
+        if not await self._verify_password(password, user.hash_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
             )
 
-        await redis_client.setex(f"user:{username}", 3600, json.dumps(user.to_dict()))
+        if password_hasher.needs_rehash(user.hash_password):
+            # The plain password is only available here, so hashes made with
+            # an outdated cost are upgraded on the next successful login.
+            user = await self.user_repository.update_password(
+                user, await self._hash_password(password)
+            )
+
+        await principal_cache.set(user)
         return user
 
     async def register_user(self, user_data: UserCreate) -> User:
@@ -80,17 +92,22 @@ class AuthService:
         except Exception as e:
             print(e)
 
-        hashed_password = self._hash_password(user_data.password)
+        hashed_password = await self._hash_password(user_data.password)
         user = await self.user_repository.create_user(
             user_data, hashed_password, avatar
         )
         return user
 
-    def create_access_token(self, username: str) -> str:
+    def create_access_token(self, username: str, token_epoch: int = 0) -> str:
         expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         expire = datetime.now(timezone.utc) + expires_delta
 
-        to_encode = {"sub": username, "exp": expire}
+        to_encode = {
+            "sub": username,
+            "exp": expire,
+            "jti": uuid.uuid4().hex,
+            "epoch": token_epoch,
+        }
         encoded_jwt = jwt.encode(
             to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
         )
@@ -110,22 +127,62 @@ class AuthService:
         return token
 
     def decode_and_validate_access_token(self, token: str) -> dict:
+        digest = self._hash_token(token)
+        payload = access_token_cache.get(digest)
+        if payload is not None:
+            return payload
         try:
             payload = jwt.decode(
                 token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
             )
-            return payload
         except jwt.PyJWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Token wrong"
             )
+        exp = payload.get("exp")
+        if exp is not None:
+            access_token_cache.set(digest, payload, ttl=exp - time.time())
+        return payload
 
-    async def get_current_user(self, token: str = Depends(oauth2_scheme)) -> User:
-        if await redis_client.exists(f"bl:{token}"):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
-            )
+    async def _load_principal(
+        self, token: str, payload: dict, username: str
+    ) -> tuple[bool, User | None]:
+        """Check revocation and look up the cached principal together.
+
+        Whatever cannot be answered in process goes to Redis as a single
+        pipeline, so a request costs at most one round trip here.
+        """
+        jti = payload.get("jti")
+        if jti is None:
+            # issued before tokens carried a jti
+            revocation_key = f"bl:{token}"
+        elif token_revocation.maybe_revoked(jti):
+            revocation_key = token_revocation.key(jti)
+        else:
+            revocation_key = None
+        user = principal_cache.get_local(username)
+        if revocation_key is None and user is not None:
+            return False, user
+
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                if revocation_key is not None:
+                    pipe.exists(revocation_key)
+                if user is None:
+                    pipe.get(principal_cache.key(username))
+                results = await pipe.execute()
+        except RedisError:
+            if revocation_key is not None:
+                raise
+            logger.warning("Principal cache unavailable", exc_info=True)
+            return False, None
 
+        revoked = bool(results.pop(0)) if revocation_key is not None else False
+        if user is None:
+            user = principal_cache.from_cached(username, results.pop(0))
+        return revoked, user
+
+    async def get_current_user(self, token: str = Depends(oauth2_scheme)) -> User:
         payload = self.decode_and_validate_access_token(token)
         username = payload.get("sub")
         if username is None:
@@ -133,37 +190,49 @@ class AuthService:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
             )
-        cached_user = await redis_client.get(f"user:{username}")
-        if cached_user:
-            user_data = json.loads(cached_user.from_dict())
-            return User(**user_data)
-
-        user = await self.user_repository.get_by_username(username)
 
+        revoked, user = await self._load_principal(token, payload, username)
+        if revoked:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
+            )
         if user is None:
+            user = await self.user_repository.get_by_username(username)
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Could not validate credentials",
+                )
+            # a replica may not have replayed the user's latest write yet;
+            # keep its copy no longer than their reads stay on the primary
+            ttl = settings.DB_REPLICA_STICKY_SECONDS if self.db.info.get("replica") else None
+            await principal_cache.set(user, ttl=ttl)
+
+        if payload.get("epoch", 0) != user.token_epoch:
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
             )
-        await redis_client.setex(f"user:{username}", 3600, json.dumps(user.to_dict()))
         return user
 
-    async def validate_refresh_token(self, token: str) -> User:
-        token_hash = self._hash_token(token)
+    async def rotate_refresh_token(
+        self, token: str, ip_address: str | None, user_agent: str | None
+    ) -> tuple[str, int, str]:
+        new_token = secrets.token_urlsafe(32)
         current_time = datetime.now(timezone.utc)
-        refresh_token = await self.refresh_token_repository.get_active_token(
-            token_hash, current_time
+        owner = await self.refresh_token_repository.rotate_token(
+            self._hash_token(token),
+            self._hash_token(new_token),
+            current_time + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            ip_address,
+            user_agent,
+            current_time,
         )
-        if refresh_token is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
-            )
-        user = await self.user_repository.get_by_id(refresh_token.user_id)
-        if user is None:
+        if owner is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
             )
-        return user
+        username, token_epoch = owner
+        return username, token_epoch, new_token
 
     async def revoke_refresh_token(self, token: str) -> None:
         token_hash = self._hash_token(token)
@@ -178,9 +247,19 @@ class AuthService:
     async def revoke_access_token(self, token: str) -> None:
         payload = self.decode_and_validate_access_token(token)
         exp = payload.get("exp")
-        print(exp - datetime.now(timezone.utc).timestamp())
-        if exp:
-            await redis_client.setex(
-                f"bl:{token}", int(exp - datetime.now(timezone.utc).timestamp()), "1"
+        jti = payload.get("jti")
+        ttl = int(exp - datetime.now(timezone.utc).timestamp()) if exp else 0
+        if ttl > 0 and jti:
+            token_revocation.remember(jti, exp)
+            await redis_client.setex(token_revocation.key(jti), ttl, "1")
+            await redis_client.publish(
+                token_revocation.CHANNEL, token_revocation.message(jti, exp)
             )
-        return None
\ No newline at end of file
+        elif ttl > 0:
+            await redis_client.setex(f"bl:{token}", ttl, "1")
+        access_token_cache.pop(self._hash_token(token))
+        return None
+
+    async def revoke_all_tokens(self, user: User) -> None:
+        await self.user_repository.bump_token_epoch(user)
+        await self.refresh_token_repository.revoke_all_for_user(user.id)
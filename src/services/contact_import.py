@@ -0,0 +1,168 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf import constants
+from src.conf.config import settings
+from src.entity.models import User
+from src.repository.contacts_book import ContactBookRepository
+from src.schemas.contact_book import (
+    ContactBookSchema,
+    ContactImportError,
+    ContactImportReport,
+)
+
+CSV_COLUMNS = tuple(ContactBookSchema.model_fields)
+# Contact_Book column widths; a longer value would fail its whole COPY batch
+MAX_LENGTHS = {
+    "name": constants.USER_NAME_MAX_LENGTH,
+    "surname": constants.USER_SURNAME_MAX_LENGTH,
+    "email": constants.USER_EMAIL_MAX_LENGTH,
+    "phone": constants.PHONE_NUMBER_MAX_LENGTH,
+}
+
+
+def _line_too_long(number: int, max_length: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Line {number} is longer than {max_length} characters",
+    )
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_length: int = settings.CONTACT_IMPORT_MAX_LINE_LENGTH,
+) -> AsyncIterator[tuple[int, str]]:
+    """Split a UTF-8 byte stream into ``(line_number, line)`` pairs as it arrives.
+
+    Raises 413 as soon as a line grows past ``max_length`` characters, so a
+    stream without newlines cannot grow the buffer without bound.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    number = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            number += 1
+            line = line.rstrip("\r")
+            if len(line) > max_length:
+                raise _line_too_long(number, max_length)
+            yield number, line
+        if len(buffer) > max_length:
+            raise _line_too_long(number + 1, max_length)
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield number + 1, buffer.rstrip("\r")
+
+
+def _too_long(contact: dict) -> list[str]:
+    return [
+        f"{field}: String should have at most {limit} characters"
+        for field, limit in MAX_LENGTHS.items()
+        if len(contact[field]) > limit
+    ]
+
+
+def _format_errors(exc: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+class ContactImportService:
+    """Imports contacts from a CSV or NDJSON upload without buffering it.
+
+    Lines are parsed and validated against ``ContactBookSchema`` as they
+    stream in; valid rows are written ``chunk_size`` at a time, each chunk
+    in its own transaction. Invalid rows, and rows with values wider than
+    their column, are skipped and reported by line number, keeping at most
+    ``max_errors`` messages.
+
+    CSV needs a header row naming the ``ContactBookSchema`` fields; quoted
+    values may not span lines.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        chunk_size: int = settings.CONTACT_IMPORT_CHUNK_SIZE,
+        max_errors: int = settings.CONTACT_IMPORT_MAX_ERRORS,
+    ):
+        self.contacts_repository = ContactBookRepository(db)
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    async def _csv_records(
+        self, lines: AsyncIterator[tuple[int, str]]
+    ) -> AsyncIterator[tuple[int, dict | None]]:
+        header = None
+        async for number, line in lines:
+            if not line.strip():
+                continue
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [value.strip() for value in values]
+                missing = [name for name in CSV_COLUMNS if name not in header]
+                if missing:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"CSV header is missing columns: {', '.join(missing)}",
+                    )
+                continue
+            yield number, dict(zip(header, values))
+
+    async def _ndjson_records(
+        self, lines: AsyncIterator[tuple[int, str]]
+    ) -> AsyncIterator[tuple[int, dict | None]]:
+        async for number, line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield number, record if isinstance(record, dict) else None
+
+    async def import_contacts(
+        self, chunks: AsyncIterator[bytes], fmt: str, user: User
+    ) -> ContactImportReport:
+        parse = self._csv_records if fmt == "csv" else self._ndjson_records
+        report = ContactImportReport()
+        batch: list[dict] = []
+
+        def fail(number: int, errors: list[str]) -> None:
+            report.failed += 1
+            if len(report.errors) < self.max_errors:
+                report.errors.append(ContactImportError(line=number, errors=errors))
+            else:
+                report.errors_truncated = True
+
+        async for number, record in parse(iter_lines(chunks)):
+            if record is None:
+                fail(number, ["line is not a JSON object"])
+                continue
+            try:
+                contact = ContactBookSchema.model_validate(record)
+            except ValidationError as exc:
+                fail(number, _format_errors(exc))
+                continue
+            contact = contact.model_dump()
+            errors = _too_long(contact)
+            if errors:
+                fail(number, errors)
+                continue
+            batch.append(contact)
+            if len(batch) >= self.chunk_size:
+                report.imported += await self.contacts_repository.create_contacts(batch, user)
+                batch = []
+        if batch:
+            report.imported += await self.contacts_repository.create_contacts(batch, user)
+        return report
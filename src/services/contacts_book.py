@@ -1,8 +1,17 @@
+from datetime import date
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.contacts_cache import contacts_cache
 from src.entity.models import User
 from src.repository.contacts_book import ContactBookRepository
-from src.schemas.contact_book import ContactBookSchema, ContactBookUpdateSchema , ContactBookResponse
+from src.schemas.contact_book import (
+    ContactBookSchema,
+    ContactBookUpdateSchema,
+    ContactBookResponse,
+    ContactBulkSelection,
+    ContactBulkUpdate,
+)
 
 
 class ContactBookService:
@@ -12,15 +21,71 @@ class ContactBookService:
     async def create_contact(self, body: ContactBookSchema, user: User):
         return await self.todo_repository.create_contact(body, user)
 
-    async def get_contacts(self, limit: int, offset: int, user: User):
-        return await self.todo_repository.get_contact(limit, offset, user)
+    async def get_contacts(self, limit: int, offset: int, user: User, after_id: int | None = None):
+        return await self.todo_repository.get_contact(limit, offset, user, after_id)
+
+    async def get_contacts_cached(
+        self, limit: int, offset: int, user: User, after_id: int | None, version: str | None
+    ) -> tuple[list[dict], int]:
+        """Serialized contact page and the user's contact count, read through
+        the cache when ``version`` is known."""
+        params = (limit, offset, after_id)
+        if version is not None:
+            cached = await contacts_cache.get("page", user.id, version, *params)
+            if cached is not None:
+                return cached["items"], cached["total"]
+        contacts = await self.get_contacts(limit, offset, user, after_id)
+        page = [ContactBookResponse.model_validate(contact).model_dump(mode="json") for contact in contacts]
+        total = await self.count_contacts(user)
+        if version is not None:
+            await contacts_cache.set(
+                "page", user.id, version, *params, value={"items": page, "total": total}
+            )
+        return page, total
+
+    async def count_contacts(self, user: User) -> int:
+        return await self.todo_repository.count_contacts(user)
+
+    async def count_all_contacts(self) -> int:
+        return await self.todo_repository.count_all_contacts()
+
+    async def search_contacts(self, query: str, limit: int, user: User):
+        return await self.todo_repository.search_contacts(query, limit, user)
+
+    async def get_upcoming_birthdays(self, days: int, user: User):
+        return await self.todo_repository.get_upcoming_birthdays(days, user, date.today())
 
     async def get_contact(self, contact_id: int, user: User):
         return await self.todo_repository.get_contact_by_id(contact_id, user)
 
+    async def get_contact_cached(
+        self, contact_id: int, user: User, version: str | None
+    ) -> dict | None:
+        """Serialized contact, read through the cache when ``version`` is known."""
+        if version is not None:
+            cached = await contacts_cache.get("item", user.id, version, contact_id)
+            if cached is not None:
+                return cached
+        contact = await self.get_contact(contact_id, user)
+        if contact is None:
+            return None
+        item = ContactBookResponse.model_validate(contact).model_dump(mode="json")
+        if version is not None:
+            await contacts_cache.set("item", user.id, version, contact_id, value=item)
+        return item
+
     async def update_contact(self, contact_id: int, body: ContactBookUpdateSchema, user: User):
         return await self.todo_repository.update_contact(contact_id, body, user)
 
 
     async def remove_contact(self, contact_id: int, user: User):
         return await self.todo_repository.remove_contact(contact_id, user)
+
+
+    async def update_contacts(self, body: ContactBulkUpdate, user: User):
+        return await self.todo_repository.update_contacts(
+            body.changes.model_dump(exclude_none=True), user, body.ids, body.filter
+        )
+
+    async def remove_contacts(self, body: ContactBulkSelection, user: User):
+        return await self.todo_repository.remove_contacts(user, body.ids, body.filter)
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.conf.config import settings
+from src.core.metrics import metrics
+from src.database.db import sessionmanager
+from src.repository.refresh_token_repository import RefreshTokenRepository
+
+logger = logging.getLogger("uvicorn.error")
+
+purged_total = metrics.counter(
+    "refresh_tokens_purged_total", "Expired or revoked refresh tokens deleted."
+)
+purge_duration = metrics.gauge(
+    "refresh_token_purge_duration_seconds", "Duration of the last purge run."
+)
+purge_last_run = metrics.gauge(
+    "refresh_token_purge_last_run_timestamp_seconds", "Unix time the last purge finished."
+)
+
+
+async def purge_expired_tokens(
+    batch_size: int = settings.TOKEN_PURGE_BATCH_SIZE,
+    pause: float = settings.TOKEN_PURGE_PAUSE_SECONDS,
+) -> int:
+    """Delete expired and long-revoked refresh tokens in bounded batches.
+
+    Each batch is its own short transaction, so the purge never holds locks
+    long enough to stall logins; ``pause`` seconds are yielded between
+    batches. Returns the number of rows deleted.
+    """
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=settings.REFRESH_TOKEN_REVOKED_RETENTION_DAYS)
+    purged = 0
+    async with sessionmanager.session() as db:
+        repository = RefreshTokenRepository(db)
+        for delete_batch, bound in (
+            (repository.delete_expired_batch, now),
+            (repository.delete_revoked_batch, cutoff),
+        ):
+            while True:
+                deleted = await delete_batch(bound, batch_size)
+                purged += deleted
+                if deleted < batch_size:
+                    break
+                await asyncio.sleep(pause)
+
+    elapsed = time.perf_counter() - started
+    purged_total.inc(purged)
+    purge_duration.set(elapsed)
+    purge_last_run.set(time.time())
+    logger.info(
+        "refresh_token_purge purged=%d duration_seconds=%.3f", purged, elapsed
+    )
+    return purged
@@ -66,5 +66,5 @@ class UserService:
                 detail="User not found"
             )
 
-        hashed_password = get_password_hash(new_password)
+        hashed_password = await get_password_hash(new_password)
         return await self.user_repository.update_password(user, hashed_password)
\ No newline at end of file
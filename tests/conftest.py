@@ -1,14 +1,25 @@
 import asyncio
+from contextlib import contextmanager
+from unittest.mock import patch
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
+from benchmarks.fake_redis import fake_redis_client
 from main import app
+from src.core.contacts_cache import contacts_cache
+from src.core.contacts_version import contacts_version
+from src.core.depend_service import get_read_db
+from src.core.principal_cache import principal_cache
+from src.core.token_revocation import token_revocation
+from src.core.write_fence import write_fence
 from src.entity.models import Base, User, UserRole
 from src.database.db import get_db
+from src.services import auth
 from src.services.auth import AuthService
 
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -23,6 +34,38 @@ TestingSessionLocal = async_sessionmaker(
     autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
 
+
+
+@contextmanager
+def count_statements():
+    """Collect the SQL statements sent to the test database inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def count_checkouts():
+    """Count connections checked out of the test database pool inside the block."""
+    checkouts = []
+
+    def checkout(*args):
+        checkouts.append(args)
+
+    event.listen(engine.sync_engine, "checkout", checkout)
+    try:
+        yield checkouts
+    finally:
+        event.remove(engine.sync_engine, "checkout", checkout)
+
+
 test_user = {
     "username": "nikita",
     "email": "nikita@gmail.com",
@@ -38,7 +81,7 @@ def init_models_wrap():
             await conn.run_sync(Base.metadata.create_all)
         async with TestingSessionLocal() as session:
             auth_service = AuthService(session)
-            hash_password = auth_service._hash_password(test_user["password"])  # noqa
+            hash_password = await auth_service._hash_password(test_user["password"])  # noqa
             current_user = User(
                 username=test_user["username"],
                 email=test_user["email"],
@@ -53,6 +96,21 @@ def init_models_wrap():
     asyncio.run(init_models())
 
 
+@pytest.fixture(autouse=True)
+def fake_redis():
+    redis = fake_redis_client()
+    with patch.object(auth, "redis_client", redis), patch.object(
+        principal_cache, "redis", redis
+    ), patch.object(token_revocation, "redis", redis), patch.object(
+        contacts_version, "redis", redis
+    ), patch.object(contacts_cache, "redis", redis), patch.object(
+        write_fence, "redis", redis
+    ):
+        principal_cache.local.clear()
+        auth.access_token_cache.clear()
+        yield redis
+
+
 @pytest.fixture(scope="module")
 def client():
     # Dependency override
@@ -66,6 +124,7 @@ def client():
                 raise
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     yield TestClient(app)
 
@@ -0,0 +1,43 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.core import contacts_cache as module
+from src.core.contacts_cache import ContactsCache
+
+
+@pytest.mark.asyncio
+async def test_entries_are_scoped_to_version(fake_redis):
+    cache = ContactsCache(fake_redis, page_ttl=60, item_ttl=60)
+    hits, misses = module.cache_hits.value, module.cache_misses.value
+
+    await cache.set("page", 1, "v1", 10, 0, None, value=[{"id": 1}])
+
+    assert await cache.get("page", 1, "v1", 10, 0, None) == [{"id": 1}]
+    assert await cache.get("page", 1, "v2", 10, 0, None) is None
+    assert await cache.get("page", 2, "v1", 10, 0, None) is None
+    assert (module.cache_hits.value - hits, module.cache_misses.value - misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_kind(fake_redis):
+    cache = ContactsCache(fake_redis, page_ttl=60, item_ttl=0)
+
+    await cache.set("item", 1, "v1", 5, value={"id": 5})
+
+    assert await cache.get("item", 1, "v1", 5) is None
+    assert fake_redis.round_trips == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_is_a_miss():
+    redis = AsyncMock()
+    redis.get.side_effect = redis.setex.side_effect = ConnectionError("down")
+    cache = ContactsCache(redis, page_ttl=60, item_ttl=60)
+    errors = module.cache_errors.value
+
+    assert await cache.get("item", 1, "v1", 5) is None
+    await cache.set("item", 1, "v1", 5, value={"id": 5})
+
+    assert module.cache_errors.value - errors == 2
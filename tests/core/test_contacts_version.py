@@ -0,0 +1,51 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.core.contacts_version import ContactsVersion
+from src.core.etag import etag_matches, weak_etag
+
+
+@pytest.mark.asyncio
+async def test_version_is_stable_until_bumped(fake_redis):
+    versions = ContactsVersion(fake_redis, ttl=60)
+
+    first = await versions.get(1)
+    assert await versions.get(1) == first
+    assert await versions.get(2) != first
+
+    await versions.bump(1)
+    assert await versions.get(1) != first
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_disables_versions():
+    redis = AsyncMock()
+    redis.get.side_effect = redis.set.side_effect = redis.delete.side_effect = ConnectionError("down")
+    versions = ContactsVersion(redis, ttl=60)
+
+    assert await versions.get(1) is None
+    await versions.bump(1)
+
+
+@pytest.mark.asyncio
+async def test_failed_bump_clears_the_version():
+    redis = AsyncMock()
+    redis.set.side_effect = ConnectionError("read only")
+    versions = ContactsVersion(redis, ttl=60)
+
+    await versions.bump(1)
+
+    redis.delete.assert_awaited_once_with(ContactsVersion.key(1))
+
+
+def test_etag_matching():
+    etag = weak_etag("contact", 1, "2026-01-01T00:00:00")
+
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches(weak_etag("contact", 1, "2026-01-01T00:00:01"), etag)
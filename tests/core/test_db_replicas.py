@@ -0,0 +1,125 @@
+import pytest
+import pytest_asyncio
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from unittest.mock import AsyncMock
+
+from src.database import db
+from src.database.db import DatabaseSessionManager
+from src.core.write_fence import WriteFence
+
+
+async def label_database(url: str, label: str) -> None:
+    manager = DatabaseSessionManager(url)
+    async with manager.session() as session:
+        await session.execute(text("CREATE TABLE node (label TEXT)"))
+        await session.execute(text("INSERT INTO node VALUES (:label)"), {"label": label})
+        await session.commit()
+    await manager.close()
+
+
+async def read_label(manager: DatabaseSessionManager, primary: bool = False) -> str:
+    async with manager.read_session(primary) as session:
+        return (await session.execute(text("SELECT label FROM node"))).scalar_one()
+
+
+@pytest_asyncio.fixture
+async def databases(tmp_path):
+    urls = {name: f"sqlite+aiosqlite:///{tmp_path / name}.db" for name in ("primary", "replica")}
+    for name, url in urls.items():
+        await label_database(url, name)
+    return urls
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_unless_primary_requested(databases):
+    manager = DatabaseSessionManager(databases["primary"], [databases["replica"]])
+    try:
+        assert await read_label(manager) == "replica"
+        assert await read_label(manager, primary=True) == "primary"
+        async with manager.session() as session:
+            assert (await session.execute(text("SELECT label FROM node"))).scalar_one() == "primary"
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_replica_sessions_are_marked(databases):
+    manager = DatabaseSessionManager(databases["primary"], [databases["replica"]])
+    try:
+        for primary in (False, True):
+            async with manager.read_session(primary) as session:
+                await session.execute(text("SELECT 1"))
+                assert session.info.get("replica", False) is not primary
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_to_primary(databases, tmp_path):
+    missing = f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    manager = DatabaseSessionManager(databases["primary"], [missing])
+    fallbacks = db.primary_reads.value
+    try:
+        assert await read_label(manager) == "primary"
+        assert manager._replicas[0].healthy is False
+        assert db.primary_reads.value == fallbacks + 1
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary(databases, monkeypatch):
+    monkeypatch.setitem(db.REPLICA_LAG_SQL, "sqlite", "SELECT 30")
+    manager = DatabaseSessionManager(databases["primary"], [databases["replica"]])
+    try:
+        assert await read_label(manager) == "primary"
+        # the verdict is kept until the next check is due
+        monkeypatch.setitem(db.REPLICA_LAG_SQL, "sqlite", "SELECT 0")
+        assert await read_label(manager) == "primary"
+        manager._replicas[0].checked_at = float("-inf")
+        assert await read_label(manager) == "replica"
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_write_fence_window(fake_redis):
+    fence = WriteFence(fake_redis, window=10)
+
+    assert await fence.recent("alice") is False
+    await fence.mark("alice")
+    assert await fence.recent("alice") is True
+    assert await fence.recent("bob") is False
+
+
+@pytest.mark.asyncio
+async def test_write_fence_sends_everyone_to_primary_without_redis():
+    redis = AsyncMock()
+    redis.exists.side_effect = RedisError("down")
+
+    assert await WriteFence(redis, window=10).recent("alice") is True
+    assert await WriteFence(redis, window=0).recent("alice") is False
+
+
+@pytest.mark.asyncio
+async def test_read_session_routes_on_first_statement(databases):
+    manager = DatabaseSessionManager(databases["primary"], [databases["replica"]])
+    sticky = AsyncMock(return_value=False)
+    try:
+        async with manager.read_session(sticky=sticky) as session:
+            pass
+        sticky.assert_not_awaited()
+        assert manager._replicas[0].checked_at == float("-inf")
+
+        async with manager.read_session(sticky=sticky) as session:
+            assert (await session.execute(text("SELECT label FROM node"))).scalar_one() == "replica"
+            assert (await session.execute(text("SELECT label FROM node"))).scalar_one() == "replica"
+        sticky.assert_awaited_once()
+
+        sticky.return_value = True
+        assert await read_label(manager) == "replica"
+        async with manager.read_session(sticky=sticky) as session:
+            assert (await session.execute(text("SELECT label FROM node"))).scalar_one() == "primary"
+    finally:
+        await manager.close()
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.hashing import PasswordHasher, PasswordHashingExecutor, bcrypt_hash, calibrate
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_in_pool():
+    executor = PasswordHashingExecutor("thread", max_workers=1, queue_limit=1)
+    hasher = PasswordHasher(executor, rounds=4)
+    try:
+        hashed = await hasher.hash("12345678")
+        assert await hasher.verify("12345678", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert executor.in_flight == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_returns_503():
+    executor = PasswordHashingExecutor("thread", max_workers=1, queue_limit=0)
+    release = threading.Event()
+    try:
+        busy = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(HTTPException) as exc:
+            await PasswordHasher(executor, rounds=4).hash("12345678")
+
+        assert exc.value.status_code == 503
+        release.set()
+        await busy
+        assert executor.in_flight == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_unknown_executor_kind():
+    with pytest.raises(ValueError):
+        PasswordHashingExecutor("fork", max_workers=1, queue_limit=0)
+
+
+@pytest.mark.asyncio
+async def test_hash_uses_configured_cost():
+    hasher = PasswordHasher(PasswordHashingExecutor("inline", 1, 0), rounds=5)
+
+    hashed = await hasher.hash("12345678")
+
+    assert PasswordHasher.cost_of(hashed) == 5
+    assert not hasher.needs_rehash(hashed)
+
+
+def test_needs_rehash_on_cost_change():
+    hasher = PasswordHasher(PasswordHashingExecutor("inline", 1, 0), rounds=5)
+
+    assert hasher.needs_rehash(bcrypt_hash("12345678", 4))
+    assert hasher.needs_rehash("not-a-bcrypt-hash")
+
+
+def test_invalid_rounds_rejected():
+    with pytest.raises(ValueError):
+        PasswordHasher(PasswordHashingExecutor("inline", 1, 0), rounds=3)
+
+
+def test_calibrate_stops_past_target():
+    timings = calibrate(target_ms=0, samples=1, min_rounds=4, max_rounds=6)
+
+    assert [rounds for rounds, _ in timings] == [4]
@@ -0,0 +1,92 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.cache import TTLCache
+from src.core.principal_cache import PrincipalCache
+from src.entity.models import User, UserRole
+
+
+@pytest.fixture
+def user():
+    return User(
+        id=1,
+        username="nikita",
+        email="nikita@gmail.com",
+        hash_password="hash",
+        avatar=None,
+        confirmed=True,
+        role=UserRole.USER,
+    )
+
+
+@pytest.fixture
+def redis_mock():
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=None)
+    redis.setex = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=None)
+    redis.pipe = pipe
+    return redis
+
+
+@pytest.fixture
+def cache(redis_mock):
+    return PrincipalCache(redis_mock, maxsize=10, local_ttl=60, redis_ttl=3600)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=60)
+    with patch("src.core.cache.time.monotonic", return_value=1000.0):
+        cache.set("a", 1)
+    with patch("src.core.cache.time.monotonic", return_value=1061.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_set_fills_local_cache(cache, redis_mock, user):
+    await cache.set(user)
+
+    cached = cache.get_local(user.username)
+
+    assert cached.id == user.id
+    assert cached.role == UserRole.USER
+    redis_mock.get.assert_not_called()
+    redis_mock.setex.assert_awaited_once()
+
+
+def test_redis_hit_fills_local_cache(cache, user):
+    first = cache.from_cached(user.username, json.dumps(user.to_dict()).encode())
+    second = cache.get_local(user.username)
+
+    assert first.username == second.username == user.username
+    assert cache.from_cached(user.username, None) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_local_entry_and_broadcasts(cache, redis_mock, user):
+    await cache.set(user)
+
+    await cache.invalidate(user.username)
+
+    assert cache.local.get(user.username) is None
+    redis_mock.pipe.delete.assert_called_once_with("user:nikita")
+    redis_mock.pipe.publish.assert_called_once_with(PrincipalCache.CHANNEL, "nikita")
+
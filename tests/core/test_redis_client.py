@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_commands_and_pipelines_count_as_round_trips(fake_redis):
+    await fake_redis.setex("a", 60, "1")
+    async with fake_redis.pipeline(transaction=False) as pipe:
+        pipe.exists("a")
+        pipe.get("a")
+        assert await pipe.execute() == [1, b"1"]
+    async with fake_redis.pipeline(transaction=False) as pipe:
+        await pipe.execute()
+
+    assert fake_redis.round_trips == 2
@@ -0,0 +1,51 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.token_revocation import TokenRevocationStore
+
+
+@pytest.fixture
+def store():
+    return TokenRevocationStore(MagicMock())
+
+
+def test_unsynced_store_cannot_rule_out_revocation(store):
+    assert store.maybe_revoked("abc") is True
+
+
+def test_synced_store_skips_unknown_jti(store):
+    store.synced = True
+    store.remember("revoked", time.time() + 60)
+
+    assert store.maybe_revoked("abc") is False
+    assert store.maybe_revoked("revoked") is True
+
+
+def test_expired_revocation_is_forgotten(store):
+    store.synced = True
+    store.remember("old", time.time() - 1)
+
+    assert store.maybe_revoked("old") is False
+    assert "old" not in store._revoked
+
+
+@pytest.mark.asyncio
+async def test_load_mirrors_revoked_keys(store):
+    async def scan_iter(match):
+        assert match == "bl:jti:*"
+        yield b"bl:jti:one"
+        yield b"bl:jti:gone"
+
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[120, -2])
+    store.redis.scan_iter = scan_iter
+    store.redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    store.redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    await store._load()
+    store.synced = True
+
+    assert store.maybe_revoked("one") is True
+    assert store.maybe_revoked("gone") is False
@@ -1,11 +1,11 @@
 import pytest
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from unittest.mock import AsyncMock, Mock
 
 from src.entity.models import Contact_Book, User
 from src.repository.contacts_book import ContactBookRepository
-from src.schemas.contact_book import ContactBookSchema, ContactBookUpdateSchema
+from src.schemas.contact_book import ContactBookSchema, ContactBookUpdateSchema, ContactBulkFilter
 
 @pytest.fixture
 def mock_session():
@@ -45,6 +45,78 @@ async def test_get_contacts(contacts_repository, mock_session, mock_user):
     assert result == mock_contacts
     mock_session.execute.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_get_contacts_after_cursor(contacts_repository, mock_session, mock_user):
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contacts_repository.get_contact(10, 0, mock_user, after_id=42)
+
+    # Assert
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert '"Contact_Book".id > 42' in sql
+    assert 'ORDER BY "Contact_Book".id' in sql
+    assert "OFFSET" not in sql
+
+@pytest.mark.asyncio
+async def test_search_contacts_uses_fts_on_sqlite(contacts_repository, mock_session, mock_user):
+    # Arrange
+    mock_session.get_bind = Mock()
+    mock_session.get_bind.return_value.dialect.name = "sqlite"
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contacts_repository.search_contacts('jo"hn', 20, mock_user)
+
+    # Assert
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert "contact_book_fts MATCH '\"jo\"\"hn\"'" in sql
+    assert "ORDER BY bm25(contact_book_fts)" in sql
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_wrap_year_end(contacts_repository, mock_session, mock_user):
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contacts_repository.get_upcoming_birthdays(7, mock_user, date(2026, 12, 29))
+
+    # Assert
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert '"Contact_Book".birth_month_day >= 1229 OR "Contact_Book".birth_month_day <= 105' in sql
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_feb_29_in_common_year(contacts_repository, mock_session, mock_user):
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contacts_repository.get_upcoming_birthdays(8, mock_user, date(2027, 2, 20))
+
+    # Assert
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert "BETWEEN 220 AND 228" in sql
+    assert '"Contact_Book".birth_month_day = 229' in sql
+
+def test_birth_month_day_follows_date_of_birth():
+    contact = Contact_Book(date_of_birth=datetime(1990, 3, 14))
+    assert contact.birth_month_day == 314
+    contact.date_of_birth = datetime(1990, 12, 1)
+    assert contact.birth_month_day == 1201
+
 @pytest.mark.asyncio
 async def test_get_contact_by_id(contacts_repository, mock_session, mock_user):
     # Arrange
@@ -86,7 +158,9 @@ async def test_create_contact(contacts_repository, mock_session, mock_user):
         phone=contact_data.phone,
         date_of_birth=contact_data.date_of_birth
     )
-    mock_session.refresh.return_value = mock_contact
+    mock_result = Mock()
+    mock_result.scalar_one.return_value = mock_contact
+    mock_session.execute.return_value = mock_result
 
     # Act
     result = await contacts_repository.create_contact(contact_data, mock_user)
@@ -97,9 +171,11 @@ async def test_create_contact(contacts_repository, mock_session, mock_user):
     assert result.email == mock_contact.email
     assert result.phone == mock_contact.phone
     assert result.date_of_birth == mock_contact.date_of_birth
-    mock_session.add.assert_called_once()
+    mock_session.execute.assert_called_once()
+    assert "RETURNING" in str(mock_session.execute.call_args.args[0].compile())
     mock_session.commit.assert_called_once()
-    mock_session.refresh.assert_called_once()
+    mock_session.add.assert_not_called()
+    mock_session.refresh.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_remove_contact(contacts_repository, mock_session, mock_user):
@@ -122,7 +198,9 @@ async def test_remove_contact(contacts_repository, mock_session, mock_user):
 
     # Assert
     assert result == mock_contact
-    mock_session.delete.assert_called_once_with(mock_contact)
+    mock_session.execute.assert_called_once()
+    assert str(mock_session.execute.call_args.args[0].compile()).startswith('DELETE FROM "Contact_Book"')
+    mock_session.delete.assert_not_called()
     mock_session.commit.assert_called_once()
 
 @pytest.mark.asyncio
@@ -152,14 +230,7 @@ async def test_update_contact(contacts_repository, mock_session, mock_user):
         phone="9876543210",
         date_of_birth=datetime(1991, 2, 2)
     )
-    mock_contact = Contact_Book(
-        id=contact_id,
-        name="Old Contact",
-        surname="Old Surname",
-        email="old@test.com",
-        phone="1234567890",
-        date_of_birth=datetime(1990, 1, 1)
-    )
+    mock_contact = Contact_Book(id=contact_id, **update_data.model_dump())
     mock_result = Mock()
     mock_result.scalar_one_or_none.return_value = mock_contact
     mock_session.execute.return_value = mock_result
@@ -174,4 +245,44 @@ async def test_update_contact(contacts_repository, mock_session, mock_user):
     assert result.email == update_data.email
     assert result.phone == update_data.phone
     assert result.date_of_birth == update_data.date_of_birth
+    mock_session.execute.assert_called_once()
+    stmt = mock_session.execute.call_args.args[0]
+    assert str(stmt.compile()).startswith('UPDATE "Contact_Book"')
+    assert stmt.compile().params["birth_month_day"] == 202
     mock_session.commit.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_remove_contacts_single_statement(contacts_repository, mock_session, mock_user):
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = [3, 1]
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    result = await contacts_repository.remove_contacts(mock_user, ids=[1, 2, 3])
+
+    # Assert
+    assert result == [1, 3]
+    mock_session.execute.assert_awaited_once()
+    mock_session.commit.assert_awaited_once()
+    sql = str(mock_session.execute.call_args.args[0].compile())
+    assert sql.startswith('DELETE FROM "Contact_Book"')
+    assert "RETURNING" in sql
+
+@pytest.mark.asyncio
+async def test_update_contacts_keeps_birth_month_day(contacts_repository, mock_session, mock_user):
+    # Arrange
+    mock_result = Mock()
+    mock_result.scalars.return_value.all.return_value = [1]
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    await contacts_repository.update_contacts(
+        {"date_of_birth": datetime(1990, 7, 4)}, mock_user, filters=ContactBulkFilter(name="Bob")
+    )
+
+    # Assert
+    stmt = mock_session.execute.call_args.args[0]
+    params = stmt.compile().params
+    assert params["birth_month_day"] == 704
+    assert "Bob" in params.values()
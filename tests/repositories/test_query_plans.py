@@ -0,0 +1,265 @@
+"""Query-plan regression tests for the repository queries.
+
+Every case runs repository methods against a seeded database, captures the
+statements they send and explains each one. A case fails when a plan reads
+a large table in full (outside the scans a case explicitly allows), or when
+it drifts from the recorded baseline:
+
+- on SQLite, the default, when the ``EXPLAIN QUERY PLAN`` steps differ from
+  the ones recorded in ``query_plan_snapshot_sqlite.json``;
+- on Postgres, when a plan's total cost grows past ``COST_REGRESSION``
+  times the one recorded in ``query_plan_baseline.json``.
+
+Point ``QUERY_PLAN_DB_URL`` at a scratch Postgres database to check the
+production planner (``EXPLAIN (FORMAT JSON)``); its tables are dropped and
+recreated. A case with nothing recorded fails on either database, so the
+Postgres baseline has to be recorded once before such a run passes. After
+that, or an intended plan change, refresh the baseline of the database in
+use and commit it::
+
+    QUERY_PLAN_UPDATE_BASELINE=1 python -m pytest tests/repositories/test_query_plans.py
+"""
+import json
+import os
+import re
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.entity.models import Base, Contact_Book, RefreshToken, User, UserRole
+from src.repository.base import BaseRepository
+from src.repository.contacts_book import ContactBookRepository
+from src.repository.refresh_token_repository import RefreshTokenRepository
+from src.repository.user_repository import UserRepository
+from src.schemas.contact_book import ContactBookUpdateSchema, ContactBulkFilter
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+DB_URL = os.environ.get("QUERY_PLAN_DB_URL", "sqlite+aiosqlite://")
+BASELINE = Path(__file__).with_name(
+    "query_plan_snapshot_sqlite.json" if DB_URL.startswith("sqlite") else "query_plan_baseline.json"
+)
+UPDATE_BASELINE = os.environ.get("QUERY_PLAN_UPDATE_BASELINE") == "1"
+COST_REGRESSION = 1.5
+
+USERS = 20
+CONTACTS_PER_USER = 500
+TOKENS_PER_USER = 100
+LARGE_TABLES = {"Contact_Book", "refresh_tokens", "users"}
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def create_schema(conn) -> None:
+    Base.metadata.drop_all(conn)
+    Base.metadata.create_all(conn)
+    # create_all emits a table's indexes in set order; SQLite breaks ties
+    # between equally good indexes by that order, so rebuild them by name
+    for table in Base.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            index.drop(conn)
+            index.create(conn)
+
+
+async def seed(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(create_schema)
+        await conn.execute(insert(User), [
+            {
+                "id": u,
+                "username": f"plan{u}",
+                "email": f"plan{u}@example.com",
+                "hash_password": "x",
+                "confirmed": True,
+                "role": UserRole.USER,
+            }
+            for u in range(1, USERS + 1)
+        ])
+        await conn.execute(insert(Contact_Book), [
+            {
+                "name": f"Name{c % 50}",
+                "surname": f"Surname{c}",
+                "email": f"contact{u}.{c}@example.com",
+                "phone": f"0{u:03}{c:06}",
+                "date_of_birth": datetime(1980 + c % 30, 1, 1) + timedelta(days=c % 365),
+                "user_id": u,
+            }
+            for u in range(1, USERS + 1)
+            for c in range(CONTACTS_PER_USER)
+        ])
+        await conn.execute(insert(RefreshToken), [
+            {
+                "user_id": u,
+                "token_hash": f"hash{u}.{t}",
+                "expired_at": NOW + timedelta(days=t % 14 - 7),
+                "revoked_at": NOW - timedelta(days=t % 30) if t % 3 == 0 else None,
+            }
+            for u in range(1, USERS + 1)
+            for t in range(TOKENS_PER_USER)
+        ])
+        await conn.execute(text("ANALYZE"))
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def engine():
+    kwargs = {"poolclass": StaticPool} if DB_URL.startswith("sqlite") else {}
+    engine = create_async_engine(DB_URL, **kwargs)
+    await seed(engine)
+    yield engine
+    if not DB_URL.startswith("sqlite"):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    """Recorded plan steps (SQLite) or costs (Postgres) per case."""
+    recorded = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    yield recorded
+    if UPDATE_BASELINE:
+        BASELINE.write_text(json.dumps(recorded, indent=2, sort_keys=True) + "\n")
+
+
+@asynccontextmanager
+async def captured(engine):
+    """Collect the reads, updates and deletes sent inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and re.match(r"\s*(SELECT|UPDATE|DELETE|WITH)", statement, re.I):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def plan_step(detail: str) -> str:
+    """An ``EXPLAIN QUERY PLAN`` detail without wording older SQLite adds."""
+    detail = re.sub(r"^(SCAN|SEARCH) TABLE ", r"\1 ", detail)
+    return re.sub(r" \(~\d+ rows?\)$", "", detail)
+
+
+async def explain(engine, statement: str, parameters) -> tuple[set[str], float | list[str]]:
+    """Tables read in full by the plan, and its total cost (Postgres) or
+    steps (SQLite)."""
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            steps = [plan_step(row[-1]) for row in rows]
+            scans = {match.group(1) for step in steps if (match := re.match(r"SCAN (\w+)", step))}
+            return scans, steps
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar()
+        plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+        scans, nodes = set(), [plan]
+        while nodes:
+            node = nodes.pop()
+            if node["Node Type"] == "Seq Scan":
+                scans.add(node["Relation Name"])
+            nodes.extend(node.get("Plans", []))
+        return scans, plan["Total Cost"]
+
+
+def user(user_id: int = 1) -> User:
+    return User(id=user_id, username=f"plan{user_id}", email=f"plan{user_id}@example.com")
+
+
+async def consume(batches):
+    return [contact async for batch in batches for contact in batch]
+
+
+change = ContactBookUpdateSchema(
+    name="Renamed", surname="Planned", email="renamed@example.com",
+    phone="000", date_of_birth=datetime(1990, 5, 5),
+)
+
+# (case, method calls on a session, tables it may read in full)
+CASES = [
+    ("ContactBookRepository.get_contact[offset]", lambda s: ContactBookRepository(s).get_contact(10, 200, user()), set()),
+    ("ContactBookRepository.get_contact[after]", lambda s: ContactBookRepository(s).get_contact(10, 0, user(), after_id=5000), set()),
+    ("ContactBookRepository.stream_contacts", lambda s: consume(ContactBookRepository(s).stream_contacts(user(), 100)), set()),
+    ("ContactBookRepository.search_contacts", lambda s: ContactBookRepository(s).search_contacts("urname12", 20, user()), set()),
+    ("ContactBookRepository.get_upcoming_birthdays", lambda s: ContactBookRepository(s).get_upcoming_birthdays(7, user(), date(2026, 3, 1)), set()),
+    ("ContactBookRepository.get_upcoming_birthdays[wrap]", lambda s: ContactBookRepository(s).get_upcoming_birthdays(10, user(), date(2026, 12, 28)), set()),
+    ("ContactBookRepository.get_contact_by_id", lambda s: ContactBookRepository(s).get_contact_by_id(42, user()), set()),
+    ("ContactBookRepository.count_contacts", lambda s: ContactBookRepository(s).count_contacts(user()), set()),
+    # a sum over the per-user counters, by design
+    ("ContactBookRepository.count_all_contacts", lambda s: ContactBookRepository(s).count_all_contacts(), {"users"}),
+    ("ContactBookRepository.update_contact", lambda s: ContactBookRepository(s).update_contact(43, change, user()), set()),
+    ("ContactBookRepository.remove_contact", lambda s: ContactBookRepository(s).remove_contact(44, user()), set()),
+    ("ContactBookRepository.update_contacts[ids]", lambda s: ContactBookRepository(s).update_contacts({"surname": "Bulk"}, user(2), ids=[501, 502]), set()),
+    ("ContactBookRepository.update_contacts[filter]", lambda s: ContactBookRepository(s).update_contacts({"surname": "Bulk"}, user(2), filters=ContactBulkFilter(name="Name7")), set()),
+    ("ContactBookRepository.remove_contacts[ids]", lambda s: ContactBookRepository(s).remove_contacts(user(3), ids=[1001, 1002]), set()),
+    ("ContactBookRepository.remove_contacts[filter]", lambda s: ContactBookRepository(s).remove_contacts(user(3), filters=ContactBulkFilter(name="Name8")), set()),
+    ("UserRepository.get_by_username", lambda s: UserRepository(s).get_by_username("plan5"), set()),
+    ("UserRepository.get_user_by_email", lambda s: UserRepository(s).get_user_by_email("plan5@example.com"), set()),
+    ("BaseRepository.get_by_id", lambda s: UserRepository(s).get_by_id(5), set()),
+    # lists every user, by design
+    ("BaseRepository.get_all", lambda s: UserRepository(s).get_all(), {"users"}),
+    ("UserRepository.confirmed_email", lambda s: UserRepository(s).confirmed_email("plan6@example.com"), set()),
+    ("UserRepository.update_avatar_url", lambda s: UserRepository(s).update_avatar_url("plan6@example.com", "https://a"), set()),
+    ("UserRepository.bump_token_epoch", lambda s: UserRepository(s).bump_token_epoch(user(6)), set()),
+    ("RefreshTokenRepository.get_by_token_hash", lambda s: RefreshTokenRepository(s).get_by_token_hash("hash1.1"), set()),
+    ("RefreshTokenRepository.get_active_token", lambda s: RefreshTokenRepository(s).get_active_token("hash1.10", NOW), set()),
+    ("RefreshTokenRepository.rotate_token", lambda s: RefreshTokenRepository(s).rotate_token("hash1.11", "hash1.new", NOW + timedelta(days=7), None, None, NOW), set()),
+    ("RefreshTokenRepository.revoke_all_for_user", lambda s: RefreshTokenRepository(s).revoke_all_for_user(7), set()),
+    ("RefreshTokenRepository.delete_expired_batch", lambda s: RefreshTokenRepository(s).delete_expired_batch(NOW - timedelta(days=6), 50), set()),
+    ("RefreshTokenRepository.delete_revoked_batch", lambda s: RefreshTokenRepository(s).delete_revoked_batch(NOW - timedelta(days=28), 50), set()),
+]
+
+
+# methods that only INSERT, or flush ORM changes to a row already loaded
+# by primary key, have no plan worth checking
+UNCHECKED = {
+    "BaseRepository.create", "BaseRepository.update", "BaseRepository.delete",
+    "ContactBookRepository.create_contact", "ContactBookRepository.create_contacts",
+    "UserRepository.create_user", "UserRepository.update_password",
+    "RefreshTokenRepository.save_token", "RefreshTokenRepository.revoke_token",
+}
+
+
+def test_every_repository_method_has_a_case():
+    covered = {name.split("[")[0] for name, _, _ in CASES} | UNCHECKED
+    for repository in (BaseRepository, ContactBookRepository, UserRepository, RefreshTokenRepository):
+        for name, attr in vars(repository).items():
+            if name.startswith("_") or not callable(attr):
+                continue
+            assert f"{repository.__name__}.{name}" in covered, f"{repository.__name__}.{name} has no query-plan case"
+
+
+@pytest.mark.parametrize("name, call, allowed_scans", CASES, ids=[case[0] for case in CASES])
+async def test_query_plan(engine, baseline, fake_redis, name, call, allowed_scans):
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with captured(engine) as statements:
+        async with session_maker() as session:
+            await call(session)
+    assert statements, f"{name} sent no statement"
+
+    plans = []
+    for statement, parameters in statements:
+        scans, plan = await explain(engine, statement, parameters)
+        full_scans = scans & LARGE_TABLES - allowed_scans
+        assert not full_scans, f"{name} scans {sorted(full_scans)} in full:\n{statement}"
+        plans.append(plan)
+
+    if UPDATE_BASELINE:
+        baseline[name] = plans
+        return
+    assert name in baseline, f"{name} has no recorded plan in {BASELINE.name}"
+    if engine.dialect.name == "sqlite":
+        for statement, plan, recorded in zip(statements, plans, baseline[name], strict=True):
+            assert plan == recorded, f"{name} plan changed:\n{statement[0]}"
+    else:
+        for statement, cost, recorded in zip(statements, plans, baseline[name], strict=True):
+            assert cost <= recorded * COST_REGRESSION, (
+                f"{name} costs {cost:.1f}, baseline {recorded:.1f}:\n{statement[0]}"
+            )
@@ -1,5 +1,6 @@
 import pytest
 from datetime import datetime, timedelta
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 from unittest.mock import AsyncMock, Mock
 
@@ -14,6 +15,8 @@ def mock_session():
     session.commit = AsyncMock()
     session.refresh = AsyncMock()
     session.add = Mock()
+    session.get_bind = Mock()
+    session.get_bind.return_value.dialect.name = "sqlite"
     return session
 
 @pytest.fixture
@@ -108,4 +111,81 @@ async def test_revoke_token(refresh_token_repository, mock_session):
 
     # Assert
     assert mock_token.revoked_at is not None
-    mock_session.commit.assert_called_once()
\ No newline at end of file
+    mock_session.commit.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_revoke_all_for_user(refresh_token_repository, mock_session):
+    # Act
+    await refresh_token_repository.revoke_all_for_user(1)
+
+    # Assert
+    mock_session.execute.assert_called_once()
+    mock_session.commit.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_rotate_token(refresh_token_repository, mock_session):
+    # Arrange
+    current_time = datetime.now()
+    claimed = Mock()
+    claimed.scalar_one_or_none.return_value = 1
+    user_result = Mock()
+    user_result.one_or_none.return_value = Mock(username="test_user", token_epoch=2)
+    mock_session.execute.side_effect = [claimed, user_result]
+
+    # Act
+    result = await refresh_token_repository.rotate_token(
+        "old_hash", "new_hash", current_time + timedelta(days=7),
+        "127.0.0.1", "test_agent", current_time,
+    )
+
+    # Assert
+    assert result == ("test_user", 2)
+    new_token = mock_session.add.call_args.args[0]
+    assert new_token.token_hash == "new_hash"
+    assert new_token.user_id == 1
+    assert mock_session.execute.call_count == 2
+    mock_session.commit.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_rotate_token_already_used(refresh_token_repository, mock_session):
+    # Arrange
+    current_time = datetime.now()
+    claimed = Mock()
+    claimed.scalar_one_or_none.return_value = None
+    mock_session.execute.return_value = claimed
+
+    # Act
+    result = await refresh_token_repository.rotate_token(
+        "old_hash", "new_hash", current_time + timedelta(days=7),
+        "127.0.0.1", "test_agent", current_time,
+    )
+
+    # Assert
+    assert result is None
+    mock_session.add.assert_not_called()
+    mock_session.commit.assert_not_called()
+    mock_session.rollback.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_rotate_token_on_postgres_is_one_statement(refresh_token_repository, mock_session):
+    # Arrange
+    current_time = datetime.now()
+    mock_session.get_bind.return_value.dialect.name = "postgresql"
+    owner = Mock()
+    owner.one_or_none.return_value = Mock(username="test_user", token_epoch=2)
+    mock_session.execute.return_value = owner
+
+    # Act
+    result = await refresh_token_repository.rotate_token(
+        "old_hash", "new_hash", current_time + timedelta(days=7),
+        "127.0.0.1", "test_agent", current_time,
+    )
+
+    # Assert
+    assert result == ("test_user", 2)
+    mock_session.execute.assert_called_once()
+    sql = str(mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "WITH claimed AS" in sql and "issued AS" in sql
+    assert "UPDATE refresh_tokens" in sql and "INSERT INTO refresh_tokens" in sql
+    mock_session.add.assert_not_called()
+    mock_session.commit.assert_called_once()
@@ -1,8 +1,10 @@
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
-from unittest.mock import AsyncMock, Mock
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from unittest.mock import AsyncMock, Mock, call, patch
 
-from src.entity.models import User
+from src.entity.models import Base, User, UserRole
 from src.repository.user_repository import UserRepository
 from src.schemas.user import UserCreate
 
@@ -19,6 +21,24 @@ def mock_session():
 def user_repository(mock_session):
     return UserRepository(mock_session)
 
+@pytest.fixture(autouse=True)
+def mock_principal_cache():
+    with patch("src.repository.user_repository.principal_cache") as cache:
+        cache.invalidate = AsyncMock()
+        yield cache
+
+@pytest_asyncio.fixture
+async def expiring_session():
+    """A real session with the default ``expire_on_commit=True``."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=True)() as session:
+        session.add(User(username="expiring", email="expiring@example.com", hash_password="x", role=UserRole.USER))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
 @pytest.mark.asyncio
 async def test_get_by_username(user_repository, mock_session):
     # Arrange
@@ -82,10 +102,10 @@ async def test_create_user(user_repository, mock_session):
     mock_session.refresh.assert_called_once()
 
 @pytest.mark.asyncio
-async def test_confirmed_email(user_repository, mock_session):
+async def test_confirmed_email(user_repository, mock_session, mock_principal_cache):
     # Arrange
     email = "test@example.com"
-    mock_user = User(email=email, confirmed=False)
+    mock_user = User(username="test_user", email=email, confirmed=False)
     mock_result = Mock()
     mock_result.scalar_one_or_none.return_value = mock_user
     mock_session.execute.return_value = mock_result
@@ -96,13 +116,14 @@ async def test_confirmed_email(user_repository, mock_session):
     # Assert
     assert mock_user.confirmed is True
     mock_session.commit.assert_called_once()
+    mock_principal_cache.invalidate.assert_awaited_once_with("test_user")
 
 @pytest.mark.asyncio
-async def test_update_avatar_url(user_repository, mock_session):
+async def test_update_avatar_url(user_repository, mock_session, mock_principal_cache):
     # Arrange
     email = "test@example.com"
     new_url = "new_avatar_url"
-    mock_user = User(email=email, avatar="old_url")
+    mock_user = User(username="test_user", email=email, avatar="old_url")
     mock_result = Mock()
     mock_result.scalar_one_or_none.return_value = mock_user
     mock_session.execute.return_value = mock_result
@@ -114,4 +135,65 @@ async def test_update_avatar_url(user_repository, mock_session):
     # Assert
     assert result.avatar == new_url
     mock_session.commit.assert_called_once()
-    mock_session.refresh.assert_called_once()
\ No newline at end of file
+    mock_session.refresh.assert_called_once()
+    mock_principal_cache.invalidate.assert_awaited_once_with("test_user")
+
+@pytest.mark.asyncio
+async def test_update_password(user_repository, mock_session, mock_principal_cache):
+    # Arrange
+    mock_user = User(username="test_user", hash_password="old_hash")
+
+    # Act
+    result = await user_repository.update_password(mock_user, "new_hash")
+
+    # Assert
+    assert result.hash_password == "new_hash"
+    mock_session.commit.assert_called_once()
+    mock_principal_cache.invalidate.assert_awaited_once_with("test_user")
+
+@pytest.mark.asyncio
+async def test_bump_token_epoch(user_repository, mock_session, mock_principal_cache):
+    # Arrange
+    mock_user = User(id=1, username="test_user", token_epoch=0)
+    mock_result = Mock()
+    mock_result.scalar_one.return_value = 1
+    mock_session.execute.return_value = mock_result
+
+    # Act
+    result = await user_repository.bump_token_epoch(mock_user)
+
+    # Assert
+    assert result == 1
+    mock_session.execute.assert_called_once()
+    mock_session.commit.assert_called_once()
+    mock_principal_cache.invalidate.assert_awaited_once_with("test_user")
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_after_expiring_commit(expiring_session, mock_principal_cache):
+    # Arrange
+    user_repository = UserRepository(expiring_session)
+
+    # Act
+    await user_repository.confirmed_email("expiring@example.com")
+    await user_repository.update_avatar_url("expiring@example.com", "new_avatar_url")
+    user = await user_repository.get_by_username("expiring")
+    await user_repository.update_password(user, "new_hash")
+    user = await user_repository.get_by_username("expiring")
+    await user_repository.bump_token_epoch(user)
+
+    # Assert
+    assert mock_principal_cache.invalidate.await_args_list == [call("expiring")] * 4
+
+@pytest.mark.asyncio
+async def test_fence_is_set_before_cache_is_dropped(user_repository, mock_principal_cache):
+    # Arrange
+    calls = []
+    mock_principal_cache.invalidate.side_effect = lambda username: calls.append("invalidate")
+
+    # Act
+    with patch("src.repository.user_repository.write_fence") as fence:
+        fence.mark = AsyncMock(side_effect=lambda username: calls.append("mark"))
+        await user_repository.update_password(User(username="test_user"), "new_hash")
+
+    # Assert
+    assert calls == ["mark", "invalidate"]
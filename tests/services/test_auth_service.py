@@ -0,0 +1,198 @@
+from unittest.mock import AsyncMock, patch
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from src.core.cache import TTLCache
+from src.core.hashing import PasswordHasher, bcrypt_hash
+from src.core.principal_cache import principal_cache
+from src.core.token_revocation import token_revocation
+from src.entity.models import User, UserRole
+from src.services import auth
+from src.services.auth import AuthService
+
+
+@pytest.fixture
+def auth_service():
+    return AuthService(AsyncMock(info={}))
+
+
+@pytest.fixture
+def user():
+    return User(
+        id=1,
+        username="nikita",
+        email="nikita@gmail.com",
+        hash_password="",
+        avatar=None,
+        confirmed=True,
+        role=UserRole.USER,
+        token_epoch=0,
+    )
+
+
+@pytest.fixture
+def token_cache():
+    with patch.object(auth, "access_token_cache", TTLCache(10, 0)) as cache:
+        yield cache
+
+
+def test_verified_token_is_decoded_once(auth_service, token_cache):
+    token = auth_service.create_access_token("nikita")
+
+    with patch("src.services.auth.jwt.decode", wraps=jwt.decode) as decode:
+        first = auth_service.decode_and_validate_access_token(token)
+        second = auth_service.decode_and_validate_access_token(token)
+
+    assert first["sub"] == second["sub"] == "nikita"
+    decode.assert_called_once()
+    assert len(token_cache) == 1
+
+
+def test_cached_entry_expires_with_token(auth_service, token_cache):
+    token = auth_service.create_access_token("nikita")
+    payload = auth_service.decode_and_validate_access_token(token)
+
+    with patch("src.core.cache.time.monotonic", return_value=float(payload["exp"]) * 2):
+        assert token_cache.get(auth_service._hash_token(token)) is None
+
+
+def test_invalid_token_is_not_cached(auth_service, token_cache):
+    with pytest.raises(HTTPException) as exc:
+        auth_service.decode_and_validate_access_token("not-a-jwt")
+
+    assert exc.value.status_code == 401
+    assert len(token_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_revocation_checked_before_cached_payload(
+    auth_service, token_cache, fake_redis
+):
+    token = auth_service.create_access_token("nikita")
+    payload = auth_service.decode_and_validate_access_token(token)
+    await fake_redis.setex(token_revocation.key(payload["jti"]), 60, "1")
+
+    with pytest.raises(HTTPException) as exc:
+        await auth_service.get_current_user(token)
+
+    assert exc.value.detail == "Token revoked"
+
+
+def test_access_token_carries_jti_and_epoch(auth_service):
+    first = jwt.decode(
+        auth_service.create_access_token("nikita", token_epoch=3),
+        options={"verify_signature": False},
+    )
+    second = jwt.decode(
+        auth_service.create_access_token("nikita", token_epoch=3),
+        options={"verify_signature": False},
+    )
+
+    assert first["epoch"] == 3
+    assert first["jti"] != second["jti"]
+
+
+@pytest.mark.asyncio
+async def test_stale_token_epoch_is_rejected(auth_service, token_cache, user):
+    user.token_epoch = 1
+    await principal_cache.set(user)
+    token = auth_service.create_access_token("nikita", token_epoch=0)
+
+    with pytest.raises(HTTPException) as exc:
+        await auth_service.get_current_user(token)
+
+    assert exc.value.detail == "Token revoked"
+
+
+@pytest.mark.asyncio
+async def test_warm_caches_need_no_redis_round_trip(
+    auth_service, token_cache, fake_redis, user
+):
+    await principal_cache.set(user)
+    token = auth_service.create_access_token(user.username)
+    fake_redis.round_trips = 0
+
+    with patch.object(token_revocation, "synced", True):
+        current = await auth_service.get_current_user(token)
+
+    assert current.id == user.id
+    assert fake_redis.round_trips == 0
+
+
+@pytest.mark.asyncio
+async def test_cold_local_cache_costs_one_round_trip(
+    auth_service, token_cache, fake_redis, user
+):
+    await principal_cache.set(user)
+    principal_cache.local.clear()
+    token = auth_service.create_access_token(user.username)
+    fake_redis.round_trips = 0
+
+    current = await auth_service.get_current_user(token)
+
+    assert current.id == user.id
+    assert fake_redis.round_trips == 1
+    auth_service.user_repository.db.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_principal_miss_loads_user_and_caches_it(
+    auth_service, token_cache, fake_redis, user
+):
+    token = auth_service.create_access_token(user.username)
+    fake_redis.round_trips = 0
+
+    with patch.object(
+        auth_service.user_repository, "get_by_username", AsyncMock(return_value=user)
+    ):
+        current = await auth_service.get_current_user(token)
+
+    assert current is user
+    # revocation + principal lookup in one pipeline, then the write-back
+    assert fake_redis.round_trips == 2
+    assert await fake_redis.exists(principal_cache.key(user.username))
+    assert await fake_redis.ttl(principal_cache.key(user.username)) > auth.settings.DB_REPLICA_STICKY_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_principal_from_replica_is_cached_briefly(
+    auth_service, token_cache, fake_redis, user
+):
+    auth_service.db.info["replica"] = True
+    token = auth_service.create_access_token(user.username)
+
+    with patch.object(
+        auth_service.user_repository, "get_by_username", AsyncMock(return_value=user)
+    ):
+        await auth_service.get_current_user(token)
+
+    ttl = await fake_redis.ttl(principal_cache.key(user.username))
+    assert 0 < ttl <= auth.settings.DB_REPLICA_STICKY_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_cost(auth_service, user):
+    user.hash_password = bcrypt_hash("12345678", 4)
+    auth_service.user_repository = AsyncMock()
+    auth_service.user_repository.get_by_username.return_value = user
+    auth_service.user_repository.update_password.return_value = user
+
+    with patch.object(auth.password_hasher, "rounds", 5):
+        await auth_service.authenticate("nikita", "12345678")
+
+    new_hash = auth_service.user_repository.update_password.await_args.args[1]
+    assert PasswordHasher.cost_of(new_hash) == 5
+
+
+@pytest.mark.asyncio
+async def test_login_keeps_current_cost(auth_service, user):
+    user.hash_password = bcrypt_hash("12345678", 4)
+    auth_service.user_repository = AsyncMock()
+    auth_service.user_repository.get_by_username.return_value = user
+
+    with patch.object(auth.password_hasher, "rounds", 4):
+        await auth_service.authenticate("nikita", "12345678")
+
+    auth_service.user_repository.update_password.assert_not_awaited()
@@ -0,0 +1,71 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+
+from src.entity.models import User
+from src.services.contact_import import ContactImportService, iter_lines
+
+ROW = "Name,Surname,name@example.com,0501234567,1990-01-01T00:00:00\n"
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_across_chunk_boundaries():
+    text = "\ufeffab\r\nc\u00e9\nlast".encode()
+    chunks = [text[i : i + 1] for i in range(len(text))]
+
+    lines = [line async for line in iter_lines(stream(*chunks))]
+
+    assert lines == [(1, "ab"), (2, "c\u00e9"), (3, "last")]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_rejects_line_past_limit():
+    lines = iter_lines(stream(b"ok\n", b"x" * 6, b"x" * 6), max_length=10)
+
+    assert await anext(lines) == (1, "ok")
+    with pytest.raises(HTTPException) as exc:
+        await anext(lines)
+    assert exc.value.status_code == 413
+    assert exc.value.detail == "Line 2 is longer than 10 characters"
+
+
+@pytest.mark.asyncio
+async def test_rows_are_inserted_in_chunks():
+    service = ContactImportService(AsyncMock(), chunk_size=2, max_errors=1)
+    service.contacts_repository = AsyncMock()
+    service.contacts_repository.create_contacts.side_effect = lambda rows, user: len(rows)
+    body = "name,surname,email,phone,date_of_birth\n" + ROW * 5 + "bad\n" * 3
+
+    report = await service.import_contacts(stream(body.encode()), "csv", User(id=1))
+
+    sizes = [len(call.args[0]) for call in service.contacts_repository.create_contacts.await_args_list]
+    assert sizes == [2, 2, 1]
+    assert service.contacts_repository.create_contacts.await_args.args[0][0]["date_of_birth"] == datetime(1990, 1, 1)
+    assert (report.imported, report.failed) == (5, 3)
+    assert [error.line for error in report.errors] == [7]
+    assert report.errors_truncated
+
+
+@pytest.mark.asyncio
+async def test_values_wider_than_their_column_are_rejected():
+    service = ContactImportService(AsyncMock())
+    service.contacts_repository = AsyncMock()
+    service.contacts_repository.create_contacts.side_effect = lambda rows, user: len(rows)
+    body = (
+        "name,surname,email,phone,date_of_birth\n"
+        + ROW
+        + "Name,Surname,name@example.com,0501234567890123,1990-01-01T00:00:00\n"
+    )
+
+    report = await service.import_contacts(stream(body.encode()), "csv", User(id=1))
+
+    assert (report.imported, report.failed) == (1, 1)
+    assert report.errors[0].line == 3
+    assert report.errors[0].errors == ["phone: String should have at most 15 characters"]
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from conftest import TestingSessionLocal
+from src.core.metrics import metrics
+from src.entity.models import RefreshToken
+from src.services.token_purge import purge_expired_tokens, purged_total
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_in_batches():
+    now = datetime.now(timezone.utc)
+
+    def token(name, expired_at, revoked_at=None):
+        return RefreshToken(
+            user_id=1, token_hash=f"purge-{name}", expired_at=expired_at, revoked_at=revoked_at
+        )
+
+    async with TestingSessionLocal() as session:
+        await session.execute(delete(RefreshToken))
+        session.add_all(
+            [token(f"expired-{i}", now - timedelta(hours=1)) for i in range(5)]
+            + [
+                token(f"revoked-{i}", now + timedelta(days=1), now - timedelta(days=8))
+                for i in range(3)
+            ]
+            + [
+                token("active", now + timedelta(days=1)),
+                token("recently-revoked", now + timedelta(days=1), now - timedelta(days=1)),
+            ]
+        )
+        await session.commit()
+
+    before = purged_total.value
+    with patch(
+        "src.services.token_purge.sessionmanager",
+        SimpleNamespace(session=TestingSessionLocal),
+    ), patch("src.services.token_purge.asyncio.sleep") as sleep:
+        purged = await purge_expired_tokens(batch_size=2, pause=0.5)
+
+    assert purged == 8
+    assert purged_total.value - before == 8
+    # 5 expired -> 2, 2, 1 ; 3 revoked -> 2, 1
+    assert sleep.await_count == 3
+    async with TestingSessionLocal() as session:
+        remaining = await session.scalar(select(func.count()).select_from(RefreshToken))
+    assert remaining == 2
+    assert "refresh_tokens_purged_total" in metrics.render()
+
+
+def test_metrics_endpoint(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200, response.text
+    assert "# TYPE refresh_tokens_purged_total counter" in response.text
@@ -0,0 +1,13 @@
+import pytest
+
+from benchmarks.harness import BenchmarkApp
+from benchmarks.scenarios import SCENARIOS
+
+
+@pytest.mark.asyncio
+async def test_benchmark_scenarios_run():
+    async with BenchmarkApp(users=2, contacts=5) as bench:
+        for name, scenario in SCENARIOS.items():
+            result = await scenario(bench, 2, 2)
+            assert len(result.latencies) == 2, name
+            assert all(code < 400 for code in result.statuses), (name, result.statuses)
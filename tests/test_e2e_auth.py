@@ -2,9 +2,12 @@ from unittest.mock import Mock, patch
 
 import pytest
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from main import app
+from src.database.db import get_db
 from src.entity.models import User
-from conftest import TestingSessionLocal
+from conftest import TestingSessionLocal, engine
 
 user_data = {
     "username": "agent007",
@@ -136,25 +139,95 @@ def test_refresh_token(client):
     assert data["refresh_token"] != refresh_token
 
 
-def test_logout(client):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.setex.return_value = True
+def test_refresh_token_reuse(client):
+    response = client.post(
+        "api/auth/login",
+        data={
+            "username": user_data.get("username"),
+            "password": user_data.get("password"),
+        },
+    )
+    refresh_token = response.json().get("refresh_token")
 
+    response = client.post("api/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200, response.text
+
+    response = client.post("api/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401, response.text
+    assert response.json()["detail"] == "Invalid refresh token"
+
+
+def test_refresh_token_with_expiring_session(client):
+    # sessions from a default async_sessionmaker expire their objects on commit
+    expiring_session = async_sessionmaker(engine, expire_on_commit=True)
+
+    async def override_get_db():
+        async with expiring_session() as session:
+            yield session
+
+    response = client.post(
+        "api/auth/login",
+        data={
+            "username": user_data.get("username"),
+            "password": user_data.get("password"),
+        },
+    )
+    refresh_token = response.json().get("refresh_token")
+
+    previous = app.dependency_overrides[get_db]
+    app.dependency_overrides[get_db] = override_get_db
+    try:
         response = client.post(
-            "api/auth/login",
-            data={
-                "username": user_data.get("username"),
-                "password": user_data.get("password"),
-            },
-        )
-        assert response.status_code == 200, response.text
-        data = response.json()
-        access_token = data.get("access_token")
-        refresh_token = data.get("refresh_token")
-        response = client.post(
-            "api/auth/logout",
-            json={"refresh_token": refresh_token},
-            headers={"Authorization": f"Bearer {access_token}"},
+            "api/auth/refresh", json={"refresh_token": refresh_token}
         )
-        assert response.status_code == 204, response.text
+    finally:
+        app.dependency_overrides[get_db] = previous
+    assert response.status_code == 200, response.text
+    assert response.json()["refresh_token"] != refresh_token
+
+
+def test_logout(client):
+
+    response = client.post(
+        "api/auth/login",
+        data={
+            "username": user_data.get("username"),
+            "password": user_data.get("password"),
+        },
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    access_token = data.get("access_token")
+    refresh_token = data.get("refresh_token")
+    response = client.post(
+        "api/auth/logout",
+        json={"refresh_token": refresh_token},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 204, response.text
+
+
+def test_logout_all(client):
+
+    response = client.post(
+        "api/auth/login",
+        data={
+            "username": user_data.get("username"),
+            "password": user_data.get("password"),
+        },
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+
+    response = client.post("api/auth/logout-all", headers=headers)
+    assert response.status_code == 204, response.text
+
+    response = client.get("api/users/me", headers=headers)
+    assert response.status_code == 401, response.text
+    assert response.json()["detail"] == "Token revoked"
+
+    response = client.post(
+        "api/auth/refresh", json={"refresh_token": data["refresh_token"]}
+    )
+    assert response.status_code == 401, response.text
@@ -1,11 +1,14 @@
-from datetime import datetime
+import csv
+import io
+import json
+from datetime import date, datetime
 from unittest.mock import patch, Mock
 
 import pytest
 from sqlalchemy import select
 
 from src.entity.models import Contact_Book
-from conftest import TestingSessionLocal
+from conftest import TestingSessionLocal, count_checkouts, count_statements
 
 contact_data = {
     "name": "John",
@@ -16,36 +19,189 @@ contact_data = {
 }
 
 def test_create_contact(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.get.return_value = None
-        headers = {"Authorization": f"Bearer {get_token}"}
-        response = client.post("api/contacts", json=contact_data, headers=headers)
-        assert response.status_code == 201, response.text
-        data = response.json()
-        assert data["name"] == contact_data["name"]
-        assert data["surname"] == contact_data["surname"]
-        assert data["email"] == contact_data["email"]
-        assert data["phone"] == contact_data["phone"]
-        assert "id" in data
-        assert "date_of_birth" in data
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.post("api/contacts", json=contact_data, headers=headers)
+    assert response.status_code == 201, response.text
+    data = response.json()
+    assert data["name"] == contact_data["name"]
+    assert data["surname"] == contact_data["surname"]
+    assert data["email"] == contact_data["email"]
+    assert data["phone"] == contact_data["phone"]
+    assert "id" in data
+    assert "date_of_birth" in data
 
 def test_get_contacts(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.get.return_value = None
-        headers = {"Authorization": f"Bearer {get_token}"}
-        response = client.get("api/contacts", headers=headers)
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("api/contacts", headers=headers)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert isinstance(data, list)
+    if len(data) > 0:
+        assert "id" in data[0]
+        assert "name" in data[0]
+        assert "surname" in data[0]
+        assert "email" in data[0]
+        assert "phone" in data[0]
+        assert "date_of_birth" in data[0]
+
+def test_get_contacts_cursor_pages(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for i in range(12):
+        client.post("api/contacts", json={**contact_data, "name": f"Page{i}"}, headers=headers)
+    expected = [c["id"] for c in client.get("api/contacts", params={"limit": 500}, headers=headers).json()]
+
+    seen, params = [], {"limit": 10}
+    while True:
+        response = client.get("api/contacts", params=params, headers=headers)
         assert response.status_code == 200, response.text
-        data = response.json()
-        assert isinstance(data, list)
-        if len(data) > 0:
-            assert "id" in data[0]
-            assert "name" in data[0]
-            assert "surname" in data[0]
-            assert "email" in data[0]
-            assert "phone" in data[0]
-            assert "date_of_birth" in data[0]
+        seen += [c["id"] for c in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 10, "after": cursor}
+
+    assert seen == expected == sorted(expected)
+
+def test_cursor_header_is_exposed_to_browsers(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}", "Origin": "https://app.example.com"}
+    response = client.get("api/contacts", params={"limit": 10}, headers=headers)
+    assert response.status_code == 200, response.text
+    exposed = response.headers["Access-Control-Expose-Headers"].split(",")
+    assert {"X-Next-Cursor", "X-Total-Count", "ETag"} <= {h.strip() for h in exposed}
+
+def test_get_contacts_invalid_cursor(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("api/contacts", params={"after": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_search_contacts(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    client.post("api/contacts", json={**contact_data, "name": "Searchable", "phone": "0971112233"}, headers=headers)
+    client.post("api/contacts", json={**contact_data, "name": "Searcher"}, headers=headers)
+
+    response = client.get("api/contacts/search", params={"q": "SEARCHA"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert [c["name"] for c in response.json()] == ["Searchable"]
+
+    response = client.get("api/contacts/search", params={"q": "1112"}, headers=headers)
+    assert [c["phone"] for c in response.json()] == ["0971112233"]
+
+    response = client.get("api/contacts/search", params={"q": "se"}, headers=headers)
+    assert response.status_code == 422
+
+def test_upcoming_birthdays(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    today = date.today()
+    born = datetime(1992, today.month, today.day)  # a leap year, so 29 February works too
+    response = client.post(
+        "api/contacts",
+        json={**contact_data, "name": "Birthday", "date_of_birth": born.isoformat()},
+        headers=headers,
+    )
+    contact_id = response.json()["id"]
+
+    response = client.get("api/contacts/birthdays", params={"days": 0}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert contact_id in [c["id"] for c in response.json()]
+
+def test_import_contacts_csv(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}", "Content-Type": "text/csv"}
+    body = (
+        "name,surname,email,phone,date_of_birth\r\n"
+        "Imported,One,imported.one@example.com,0501,1990-05-01T00:00:00\r\n"
+        "X,Two,not-an-email,0502,1990-05-02T00:00:00\r\n"
+        '"Imported, Jr",Three,imported.three@example.com,0503,1990-05-03T00:00:00\r\n'
+    )
+    response = client.post("api/contacts/import", params={"format": "csv"}, content=body, headers=headers)
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["failed"] == 1
+    assert report["errors"][0]["line"] == 3
+    assert len(report["errors"][0]["errors"]) == 2
+
+    found = client.get("api/contacts/search", params={"q": "Imported, Jr"}, headers=headers).json()
+    assert [c["surname"] for c in found] == ["Three"]
+
+def test_import_contacts_ndjson(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}", "Content-Type": "application/x-ndjson"}
+    row = {**contact_data, "name": "Ndjson"}
+    body = "\n".join([json.dumps(row), "[1, 2]", "", "{broken", json.dumps(row)])
+    response = client.post("api/contacts/import", params={"format": "ndjson"}, content=body, headers=headers)
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["imported"] == 2
+    assert [error["line"] for error in report["errors"]] == [2, 4]
+
+def test_import_contacts_csv_missing_columns(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.post("api/contacts/import", content="name,surname\nA,B\n", headers=headers)
+    assert response.status_code == 400, response.text
+
+def test_export_contacts(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    expected = client.get("api/contacts", params={"limit": 500}, headers=headers).json()
+
+    response = client.get("api/contacts/export", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+    response = client.get("api/contacts/export", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200, response.text
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [c["id"] for c in expected]
+    assert rows[0]["email"] == expected[0]["email"]
+
+def test_bulk_update_and_delete_contacts(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    ids = [
+        client.post("api/contacts", json={**contact_data, "name": "Bulk", "phone": f"09900000{i}"}, headers=headers).json()["id"]
+        for i in range(3)
+    ]
+
+    response = client.post(
+        "api/contacts/bulk-update",
+        json={"ids": ids[:2] + [999999], "changes": {"surname": "Renamed", "date_of_birth": "1985-12-31T00:00:00"}},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"ids": ids[:2]}
+    updated = client.get(f"api/contacts/{ids[0]}", headers=headers).json()
+    assert (updated["surname"], updated["date_of_birth"]) == ("Renamed", "1985-12-31T00:00:00")
+
+    response = client.post("api/contacts/bulk-delete", json={"filter": {"name": "Bulk"}}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"ids": ids}
+    assert client.get(f"api/contacts/{ids[2]}", headers=headers).status_code == 404
+
+def test_contact_counts_follow_writes(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    before = client.get("api/contacts/stats", headers=headers).json()["total"]
+    ids = [
+        client.post("api/contacts", json={**contact_data, "name": "Counted"}, headers=headers).json()["id"]
+        for _ in range(3)
+    ]
+    body = "name,surname,email,phone,date_of_birth\nCounted,Doe,c@example.com,1,1990-01-01T00:00:00\n"
+    client.post("api/contacts/import", content=body, headers=headers)
+    client.delete(f"api/contacts/{ids[0]}", headers=headers)
+    client.post("api/contacts/bulk-delete", json={"ids": ids[1:2]}, headers=headers)
+
+    response = client.get("api/contacts/stats", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"total": before + 2}
+    response = client.get("api/contacts", headers=headers)
+    assert response.headers["X-Total-Count"] == str(before + 2)
+    response = client.get("api/contacts/stats/all", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["total"] >= before + 2
+
+def test_bulk_delete_needs_ids_or_filter(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for body in ({}, {"filter": {}}, {"ids": [1], "filter": {"name": "Bulk"}}):
+        response = client.post("api/contacts/bulk-delete", json=body, headers=headers)
+        assert response.status_code == 422, body
 
 @pytest.mark.asyncio
 async def test_get_contact_by_id(client, get_token):
@@ -63,76 +219,64 @@ async def test_get_contact_by_id(client, get_token):
         await session.commit()
         await session.refresh(contact)
 
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.get.return_value = None
-        headers = {"Authorization": f"Bearer {get_token}"}
-        response = client.get(f"api/contacts/{contact.id}", headers=headers)
-        assert response.status_code == 200, response.text
-        data = response.json()
-        assert data["id"] == contact.id
-        assert data["name"] == contact.name
-        assert data["surname"] == contact.surname
-        assert data["email"] == contact.email
-        assert data["phone"] == contact.phone
-        assert "date_of_birth" in data
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get(f"api/contacts/{contact.id}", headers=headers)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["id"] == contact.id
+    assert data["name"] == contact.name
+    assert data["surname"] == contact.surname
+    assert data["email"] == contact.email
+    assert data["phone"] == contact.phone
+    assert "date_of_birth" in data
 
 def test_get_contact_not_found(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.get.return_value = None
-        headers = {"Authorization": f"Bearer {get_token}"}
-        response = client.get("api/contacts/999999", headers=headers)
-        assert response.status_code == 404, response.text
-        data = response.json()
-        assert data["detail"] == "Contact not found"
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("api/contacts/999999", headers=headers)
+    assert response.status_code == 404, response.text
+    data = response.json()
+    assert data["detail"] == "Contact not found"
 
 def test_update_contact(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.get.return_value = None
-        headers = {"Authorization": f"Bearer {get_token}"}
+    headers = {"Authorization": f"Bearer {get_token}"}
         
-        # First create a contact
-        response = client.post("api/contacts", json=contact_data, headers=headers)
-        assert response.status_code == 201
-        contact_id = response.json()["id"]
-
-        # Update the contact
-        update_data = {
-            "name": "Jane",
-            "surname": "Smith",
-            "email": "jane.smith@example.com",
-            "phone": "0987654321",
-            "date_of_birth": "1991-02-02T00:00:00"
-        }
-        response = client.put(f"api/contacts/{contact_id}", json=update_data, headers=headers)
-        assert response.status_code == 200, response.text
-        data = response.json()
-        assert data["name"] == update_data["name"]
-        assert data["surname"] == update_data["surname"]
-        assert data["email"] == update_data["email"]
-        assert data["phone"] == update_data["phone"]
-        assert "date_of_birth" in data
+    # First create a contact
+    response = client.post("api/contacts", json=contact_data, headers=headers)
+    assert response.status_code == 201
+    contact_id = response.json()["id"]
+
+    # Update the contact
+    update_data = {
+        "name": "Jane",
+        "surname": "Smith",
+        "email": "jane.smith@example.com",
+        "phone": "0987654321",
+        "date_of_birth": "1991-02-02T00:00:00"
+    }
+    response = client.put(f"api/contacts/{contact_id}", json=update_data, headers=headers)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["name"] == update_data["name"]
+    assert data["surname"] == update_data["surname"]
+    assert data["email"] == update_data["email"]
+    assert data["phone"] == update_data["phone"]
+    assert "date_of_birth" in data
 
 def test_delete_contact(client, get_token):
-    with patch("src.services.auth.redis_client") as redis_mock:
-        redis_mock.exists.return_value = False
-        redis_mock.get.return_value = None
-        headers = {"Authorization": f"Bearer {get_token}"}
+    headers = {"Authorization": f"Bearer {get_token}"}
         
-        # First create a contact
-        response = client.post("api/contacts", json=contact_data, headers=headers)
-        assert response.status_code == 201
-        contact_id = response.json()["id"]
+    # First create a contact
+    response = client.post("api/contacts", json=contact_data, headers=headers)
+    assert response.status_code == 201
+    contact_id = response.json()["id"]
 
-        # Delete the contact
-        response = client.delete(f"api/contacts/{contact_id}", headers=headers)
-        assert response.status_code == 204
+    # Delete the contact
+    response = client.delete(f"api/contacts/{contact_id}", headers=headers)
+    assert response.status_code == 204
 
-        # Verify contact is deleted
-        response = client.get(f"api/contacts/{contact_id}", headers=headers)
-        assert response.status_code == 404
+    # Verify contact is deleted
+    response = client.get(f"api/contacts/{contact_id}", headers=headers)
+    assert response.status_code == 404
 
 def test_unauthorized_access(client):
     # Try to access contacts without token
@@ -150,3 +294,103 @@ def test_unauthorized_access(client):
     # Try to delete contact without token
     response = client.delete("api/contacts/1")
     assert response.status_code == 401, response.text
+
+def test_requests_check_out_at_most_one_connection(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    # the user lookup and the route share one session, hence one connection
+    with count_checkouts() as checkouts:
+        assert client.get("api/users/me", headers=headers).status_code == 200
+    assert len(checkouts) == 1
+
+    # with the user cached, a route that runs no statement checks out nothing
+    with count_checkouts() as checkouts:
+        assert client.get("api/users/me", headers=headers).status_code == 200
+    assert len(checkouts) == 0
+
+    for method, path in (("get", "api/contacts"), ("get", "api/contacts/stats/all"), ("post", "api/contacts")):
+        with count_checkouts() as checkouts:
+            response = client.request(method, path, json=contact_data, headers=headers)
+        assert response.status_code < 300, response.text
+        assert len(checkouts) == 1, path
+
+def test_contact_writes_take_one_statement(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    # the first request loads and caches the current user
+    client.get("api/contacts", headers=headers)
+
+    with count_statements() as statements:
+        contact_id = client.post("api/contacts", json=contact_data, headers=headers).json()["id"]
+    assert len(statements) == 1 and statements[0].startswith("INSERT"), statements
+
+    with count_statements() as statements:
+        response = client.put(f"api/contacts/{contact_id}", json={**contact_data, "name": "Once"}, headers=headers)
+    assert response.json()["name"] == "Once"
+    assert len(statements) == 1 and statements[0].startswith("UPDATE"), statements
+
+    with count_statements() as statements:
+        client.get(f"api/contacts/{contact_id}", headers=headers)
+    assert len(statements) == 1 and "JOIN" not in statements[0], statements
+
+    with count_statements() as statements:
+        client.delete(f"api/contacts/{contact_id}", headers=headers)
+    assert len(statements) == 1 and statements[0].startswith("DELETE"), statements
+
+def test_conditional_get_contacts(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("api/contacts", headers=headers)
+    etag = response.headers["ETag"]
+
+    with count_statements() as statements:
+        response = client.get("api/contacts", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert statements == []
+
+    other_page = client.get("api/contacts", params={"offset": 10}, headers=headers)
+    assert other_page.headers["ETag"] != etag
+
+    client.post("api/contacts", json=contact_data, headers=headers)
+    response = client.get("api/contacts", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_conditional_get_contact(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact_id = client.post("api/contacts", json=contact_data, headers=headers).json()["id"]
+    etag = client.get(f"api/contacts/{contact_id}", headers=headers).headers["ETag"]
+
+    with count_statements() as statements:
+        response = client.get(f"api/contacts/{contact_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert statements == []
+
+    client.put(f"api/contacts/{contact_id}", json={**contact_data, "name": "Changed"}, headers=headers)
+    response = client.get(f"api/contacts/{contact_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Changed"
+
+def test_conditional_get_contact_without_redis(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact_id = client.post("api/contacts", json=contact_data, headers=headers).json()["id"]
+
+    with patch("src.routes.contacts_book.contacts_version.get", return_value=None):
+        etag = client.get(f"api/contacts/{contact_id}", headers=headers).headers["ETag"]
+        response = client.get(f"api/contacts/{contact_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_contact_reads_are_cached(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact_id = client.post("api/contacts", json=contact_data, headers=headers).json()["id"]
+    page = client.get("api/contacts", params={"limit": 500}, headers=headers).json()
+    contact = client.get(f"api/contacts/{contact_id}", headers=headers).json()
+
+    with count_statements() as statements:
+        assert client.get("api/contacts", params={"limit": 500}, headers=headers).json() == page
+        assert client.get(f"api/contacts/{contact_id}", headers=headers).json() == contact
+    assert statements == []
+
+    client.put(f"api/contacts/{contact_id}", json={**contact_data, "name": "Recached"}, headers=headers)
+    assert client.get(f"api/contacts/{contact_id}", headers=headers).json()["name"] == "Recached"
+    page = client.get("api/contacts", params={"limit": 500}, headers=headers).json()
+    assert "Recached" in [c["name"] for c in page]